@@ -1,45 +1,183 @@
+import codecs
 import logging
 import re
-import sqlite3
 import time
 import asyncio
+import functools
 from datetime import datetime, timedelta, timezone
 
 import aiosqlite
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from kubernetes import client
 from kubernetes.client.rest import ApiException
 
 from . import k8s, worker
 from .worker import K8S_EXEC_LOCK
 
-from .config import POD_NAMESPACE, OPEN_GROK_BASE_URL, DB_PATH
-from .database import get_db_session, custom_connection_factory
+from .config import POD_NAMESPACE, OPEN_GROK_BASE_URL, EXPIRED_CLEANUP_INTERVAL_SEC
+from .database import get_db_session, get_read_db_session, pool
 from .schemas import (
     RepositoryInfo, RepositoryRequest, RepositoryExpirationUpdateRequest, JobLogs, 
     AppConfig, RepositoryAutoSyncUpdateRequest, OpenGrokPodStatus, 
     OpenGrokDeploymentStatus, OpenGrokStatusResponse, RepositoryStatus,
     RepositoryExport, RepositoriesExportResponse, RepositoriesImportRequest,
-    RepositoryImportResult, RepositoriesImportResponse
+    RepositoryImportResult, RepositoriesImportResponse, validate_commit_id,
+    validate_auto_sync_schedule
 )
 
 logger = logging.getLogger(f"uvicorn.{__name__}")
 router = APIRouter()
 scheduler = AsyncIOScheduler()
 
+# Accepts 'https://', 'http://', 'git://' and scp-like 'git@host:path' URLs ending in .git
+_GIT_URL_RE = re.compile(r"^((https?|git)://.+?|git@.+?:.+?)\.git$")
+
+# Export format version, and how many rows are encoded per streamed chunk
+_EXPORT_VERSION = RepositoriesExportResponse.model_fields["version"].default
+_STREAM_CHUNK_ROWS = 100
+
+# Statuses for which the live task log is read from the pod
+_IN_PROGRESS_STATUSES = frozenset({
+    RepositoryStatus.PENDING, RepositoryStatus.CLONING,
+    RepositoryStatus.POD_CREATING, RepositoryStatus.DELETING,
+})
+
+# Pod log requests above this many lines are streamed instead of read whole and cached
+_LOG_STREAM_MIN_LINES = 2000
+
+# Built once: its only input is read from the environment at import time
+_APP_CONFIG = AppConfig(opengrok_base_url=OPEN_GROK_BASE_URL)
+
+# Columns returned by the repository list. task_log is left out since it can be large
+# and is served by the logs endpoint instead; it is reported as null.
+_REPO_COLUMNS = (
+    "id, repo_url, commit_id, status, job_name, pvc_path, expired_at, "
+    "clone_single_branch, clone_recursive, created_at, updated_at, last_synced_at, "
+    "auto_sync_enabled, auto_sync_schedule"
+)
+# Validates and encodes list rows the same way the RepositoryInfo response model does
+_REPO_LIST_ADAPTER = TypeAdapter(list[RepositoryInfo])
+
+# pvc_paths per "IN (...)" lookup during import, keeping each query well below
+# SQLite's bound-parameter limit however large the import is
+_IMPORT_LOOKUP_CHUNK = 500
+
+
+def _schedule_auto_sync(record_id: int, schedule: str | None):
+    """
+    Adds or replaces the daily auto-sync job of a single repository,
+    or removes it when `schedule` ("HH:MM", UTC) is None.
+    """
+    job_id = f"repo-{record_id}"
+    if schedule:
+        hour, minute = map(int, schedule.split(':'))
+        scheduler.add_job(
+            worker.run_scheduled_sync,
+            CronTrigger(hour=hour, minute=minute, timezone=timezone.utc),
+            id=job_id,
+            args=[record_id],
+            replace_existing=True,
+            coalesce=True,
+            misfire_grace_time=None,
+        )
+    else:
+        try:
+            scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+
+
+async def start_scheduler():
+    """
+    Registers the auto-sync job of every enabled repository and the expired-repository
+    cleanup job, then starts the scheduler.
+    Called once on application startup, after the DB pool is opened.
+    """
+    async with pool.reader() as db:
+        async with db.execute(
+            "SELECT id, auto_sync_schedule FROM repositories "
+            "WHERE auto_sync_enabled AND auto_sync_schedule IS NOT NULL"
+        ) as cursor:
+            rows = await cursor.fetchall()
+    scheduled = 0
+    for row in rows:
+        # Rows stored before schedules were validated may not parse; skip them instead of failing startup
+        try:
+            _schedule_auto_sync(row['id'], row['auto_sync_schedule'])
+            scheduled += 1
+        except ValueError as e:
+            logger.error(
+                f"Skipping auto-sync for repo ID {row['id']}: invalid schedule "
+                f"{row['auto_sync_schedule']!r} ({e})"
+            )
+    # Removes repositories past their expiration date, first right after startup
+    scheduler.add_job(
+        cleanup_expired_repositories,
+        IntervalTrigger(seconds=EXPIRED_CLEANUP_INTERVAL_SEC),
+        id="cleanup-expired",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=datetime.now(timezone.utc),
+    )
+    scheduler.start()
+    logger.info(f"Scheduler started with {scheduled} auto-sync jobs.")
+
+
+def async_ttl_cache(ttl: float):
+    """
+    Caches the result of a coroutine function per argument tuple for `ttl` seconds.
+    Concurrent callers share the same in-flight call instead of starting their own.
+    Failed calls are not cached.
+    """
+    def decorator(func):
+        cache: dict[tuple, tuple[float, asyncio.Future]] = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args):
+            now = time.monotonic()
+            entry = cache.get(args)
+            if entry is None or (entry[1].done() and now - entry[0] >= ttl):
+                # Drop other expired entries so per-argument caches don't grow unbounded
+                for key, (started, future) in list(cache.items()):
+                    if future.done() and now - started >= ttl:
+                        del cache[key]
+
+                task = asyncio.ensure_future(func(*args))
+                entry = (now, task)
+                cache[args] = entry
+
+                def evict_on_error(t: asyncio.Future, key=args, cached=entry):
+                    if (t.cancelled() or t.exception() is not None) and cache.get(key) is cached:
+                        del cache[key]
+
+                task.add_done_callback(evict_on_error)
+            # Shield so that a cancelled caller doesn't cancel the call shared with others
+            return await asyncio.shield(entry[1])
+
+        return wrapper
+    return decorator
+
 
 @router.get("/config", response_model=AppConfig)
-async def get_app_config():
+async def get_app_config(response: Response):
     """Returns application configuration to the frontend."""
-    return AppConfig(opengrok_base_url=OPEN_GROK_BASE_URL)
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return _APP_CONFIG
 
 
 @router.post("/repository", status_code=202, response_model=RepositoryInfo)
 async def request_repository(
     req: RepositoryRequest, 
     background_tasks: BackgroundTasks,
-    db: aiosqlite.Connection = Depends(get_db_session) 
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function") 
 ):
     """
     Receives a repository URL and commit ID, then creates a K8s Job.
@@ -47,8 +185,7 @@ async def request_repository(
     """
     try:
         # Validate Git repository URL format before proceeding
-        git_url_pattern = re.compile(r"^((https?|git):\/\/.+?|git@.+?:.+?)\.git$")
-        if not git_url_pattern.match(req.repo_url):
+        if not _GIT_URL_RE.match(req.repo_url):
             raise HTTPException(
                 status_code=422,
                 detail=(
@@ -57,10 +194,11 @@ async def request_repository(
                 ),
             )
         # 0. Determine expiration date
+        now = datetime.now(timezone.utc)
         expired_at = None
         # If retention_days is a positive number, calculate the expiration date.
         if req.retention_days is not None and req.retention_days > 0:
-            expired_at = datetime.now(timezone.utc) + timedelta(days=req.retention_days)
+            expired_at = now + timedelta(days=req.retention_days)
         elif req.retention_days == 0:  # 0 means indefinite retention
             expired_at = None
 
@@ -76,33 +214,12 @@ async def request_repository(
                     detail="Invalid 'project_name'. It must consist of lowercase alphanumeric characters or '-', and start and end with an alphanumeric character."
                 )
             pvc_path = sanitized_name
-            # Check if a project with this custom name already exists
-            async with db.execute("SELECT repo_url, commit_id FROM repositories WHERE pvc_path = ?", (pvc_path,)) as cursor:
-                conflicting_repo = await cursor.fetchone()
-                if conflicting_repo:
-                    raise HTTPException(
-                        status_code=409,
-                        detail=f"Project name '{pvc_path}' is already in use by repository '{conflicting_repo['repo_url']}'. Please choose a different name."
-                    )
         else:
             # Generate the path if not provided
             repo_name_sanitized = k8s.sanitize_for_dns(req.repo_url.split('/')[-1])
             commit_hash_short = req.commit_id[:12]
             pvc_path = f"{repo_name_sanitized}-{commit_hash_short}"
 
-        # Check for duplicate request (same repo and commit)
-        async with db.execute("SELECT pvc_path FROM repositories WHERE repo_url = ? AND commit_id = ?", 
-                              (req.repo_url, req.commit_id)) as cursor:
-            existing = await cursor.fetchone()
-            
-        if existing:
-            logger.info(f"Duplicate request: {req.repo_url} @ {req.commit_id}")
-            raise HTTPException(
-                status_code=409,
-                detail=f"This repository and commit ID combination already exists under the project name '{existing['pvc_path']}'."
-            )
-
-
         # 5. Save the request to the database
         async with db.execute(
             """
@@ -111,17 +228,48 @@ async def request_repository(
                 clone_single_branch, clone_recursive, last_synced_at,
                 auto_sync_enabled, auto_sync_schedule
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+            RETURNING *
             """,
             (
-                req.repo_url, req.commit_id, RepositoryStatus.PENDING.value, "EXEC", pvc_path, 
+                req.repo_url, req.commit_id, RepositoryStatus.PENDING, "EXEC", pvc_path, 
                 expired_at, req.clone_single_branch, req.clone_recursive, 
-                datetime.now(timezone.utc),
+                now,
                 req.auto_sync_enabled,
                 req.auto_sync_schedule if req.auto_sync_enabled else None
             )
         ) as cursor:
-            await db.commit()
-            record_id = cursor.lastrowid
+            # RETURNING gives back the full row, including server-side default timestamps
+            new_record = await cursor.fetchone()
+        await db.commit()
+
+        if new_record is None:
+            # The UNIQUE constraints on pvc_path and (repo_url, commit_id) rejected the row.
+            # Look up the conflicting record only to build the error message.
+            async with db.execute(
+                "SELECT repo_url, commit_id, pvc_path FROM repositories "
+                "WHERE pvc_path = ? OR (repo_url = ? AND commit_id = ?)",
+                (pvc_path, req.repo_url, req.commit_id)
+            ) as cursor:
+                conflicts = await cursor.fetchall()
+            for row in conflicts:
+                if req.project_name and row['pvc_path'] == pvc_path:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Project name '{pvc_path}' is already in use by repository '{row['repo_url']}'. Please choose a different name."
+                    )
+            for row in conflicts:
+                if row['repo_url'] == req.repo_url and row['commit_id'] == req.commit_id:
+                    logger.info(f"Duplicate request: {req.repo_url} @ {req.commit_id}")
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"This repository and commit ID combination already exists under the project name '{row['pvc_path']}'."
+                    )
+            # The generated pvc_path collided with a different repository.
+            raise HTTPException(status_code=500, detail="Internal server error due to data conflict.")
+
+        record_id = new_record['id']
+        _schedule_auto_sync(record_id, new_record['auto_sync_schedule'])
 
         # 6. Add background task to clone repository
         background_tasks.add_task(
@@ -134,24 +282,8 @@ async def request_repository(
             recursive=req.clone_recursive
         )
         
-        # Re-fetch the newly created record to get all fields, including timestamps
-        async with db.execute("SELECT * FROM repositories WHERE id = ?", (record_id,)) as cursor:
-            new_record = await cursor.fetchone()
-            if not new_record:
-                raise HTTPException(status_code=500, detail="Failed to retrieve newly created repository record.")
         return RepositoryInfo(**new_record)
     
-    except sqlite3.IntegrityError as e:
-        # Handle race conditions if two identical requests arrive at the same time
-        logger.warning(f"Race condition likely avoided for: {req.repo_url} @ {req.commit_id}. Error: {e}")
-        async with db.execute("SELECT * FROM repositories WHERE repo_url = ? AND commit_id = ?", 
-                          (req.repo_url, req.commit_id)) as cursor:
-            existing = await cursor.fetchone()
-            if existing:
-                return RepositoryInfo(**existing)
-        # If the integrity error was for the pvc_path, the user will get a 500, which is acceptable for a race condition.
-        raise HTTPException(status_code=500, detail="Internal server error due to data conflict.")
-
     except HTTPException: # Re-raise HTTPException to avoid being caught by the generic Exception handler
         raise
 
@@ -164,28 +296,25 @@ async def request_repository(
 async def sync_repository(
     record_id: int,
     background_tasks: BackgroundTasks,
-    db: aiosqlite.Connection = Depends(get_db_session)
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function")
 ):
     """
     Triggers a re-sync of an existing repository by creating a new git-clone Job.
     The underlying script will perform a 'git pull' if the directory exists.
     """
-    # 1. Fetch the existing repository record
-    async with db.execute("SELECT * FROM repositories WHERE id = ?", (record_id,)) as cursor:
-        record = await cursor.fetchone()
-    if not record:
+    # 1. Update the database record with PENDING status, returning the updated row
+    async with db.execute(
+        "UPDATE repositories SET status = ?, job_name = 'SYNC', last_synced_at = ? WHERE id = ? RETURNING *",
+        (RepositoryStatus.PENDING, datetime.now(timezone.utc), record_id)
+    ) as cursor:
+        updated_record = await cursor.fetchone()
+    if not updated_record:
         raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
-
-    repo_info = RepositoryInfo(**record)
-
-    # 2. Update the database record with PENDING status
-    await db.execute(
-        "UPDATE repositories SET status = ?, job_name = 'SYNC', last_synced_at = ? WHERE id = ?",
-        (RepositoryStatus.PENDING.value, datetime.now(timezone.utc), record_id)
-    )
     await db.commit()
 
-    # 3. Add background task to clone/sync repository
+    repo_info = RepositoryInfo(**updated_record)
+
+    # 2. Add background task to clone/sync repository
     background_tasks.add_task(
         worker.perform_clone_task,
         record_id=record_id,
@@ -196,11 +325,7 @@ async def sync_repository(
         recursive=repo_info.clone_recursive
     )
 
-
-    # 6. Fetch and return the updated record
-    async with db.execute("SELECT * FROM repositories WHERE id = ?", (record_id,)) as cursor:
-        updated_record = await cursor.fetchone()
-    return RepositoryInfo(**updated_record)
+    return repo_info
 
 
 # Removed _trigger_repository_deletion as we use worker.perform_cleanup_task
@@ -210,7 +335,7 @@ async def sync_repository(
 async def update_repository_expiration(
     record_id: int,
     req: RepositoryExpirationUpdateRequest,
-    db: aiosqlite.Connection = Depends(get_db_session),
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function"),
 ):
     """
     Updates the expiration date of a repository.
@@ -218,26 +343,20 @@ async def update_repository_expiration(
     - `retention_days: 0` makes the repository indefinite (removes expiration).
     """
     # 1. Calculate the new expiration date
+    current_timestamp = datetime.now(timezone.utc)
     new_expired_at = None
     if req.retention_days > 0:
-        new_expired_at = datetime.now(timezone.utc) + timedelta(days=req.retention_days)
+        new_expired_at = current_timestamp + timedelta(days=req.retention_days)
 
     # 2. Update the database record
-    current_timestamp = datetime.now(timezone.utc)
     async with db.execute(
-        "UPDATE repositories SET expired_at = ?, updated_at = ? WHERE id = ?",
+        "UPDATE repositories SET expired_at = ?, updated_at = ? WHERE id = ? RETURNING *",
         (new_expired_at, current_timestamp, record_id),
     ) as cursor:
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
-        await db.commit()
-
-    # 3. Fetch and return the updated record
-    async with db.execute("SELECT * FROM repositories WHERE id = ?", (record_id,)) as cursor:
         updated_record = await cursor.fetchone()
-        if not updated_record:
-            # This case is unlikely if the update succeeded, but good for safety
-            raise HTTPException(status_code=500, detail="Failed to retrieve updated repository record.")
+    if not updated_record:
+        raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
+    await db.commit()
 
     logger.info(f"Updated expiration for repository ID {record_id}. New expiration: {new_expired_at}")
     return RepositoryInfo(**updated_record)
@@ -247,7 +366,7 @@ async def update_repository_expiration(
 async def update_repository_auto_sync(
     record_id: int,
     req: RepositoryAutoSyncUpdateRequest,
-    db: aiosqlite.Connection = Depends(get_db_session),
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function"),
 ):
     """
     Updates the auto-sync settings for a repository.
@@ -259,24 +378,20 @@ async def update_repository_auto_sync(
     schedule_to_save = req.auto_sync_schedule if req.auto_sync_enabled else None
 
     async with db.execute(
-        "UPDATE repositories SET auto_sync_enabled = ?, auto_sync_schedule = ?, updated_at = ? WHERE id = ?",
+        "UPDATE repositories SET auto_sync_enabled = ?, auto_sync_schedule = ?, updated_at = ? WHERE id = ? RETURNING *",
         (req.auto_sync_enabled, schedule_to_save, current_timestamp, record_id),
     ) as cursor:
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
-        await db.commit()
-
-    # 2. Fetch and return the updated record
-    async with db.execute("SELECT * FROM repositories WHERE id = ?", (record_id,)) as cursor:
         updated_record = await cursor.fetchone()
-        if not updated_record:
-            raise HTTPException(status_code=500, detail="Failed to retrieve updated repository record.")
+    if not updated_record:
+        raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
+    await db.commit()
 
     logger.info(
         f"Updated auto-sync for repository ID {record_id}. "
         f"Enabled: {req.auto_sync_enabled}, Schedule: {schedule_to_save}"
     )
-    # TODO: Need to notify the scheduler to update its job list
+    # Only this repository's job is touched, the scheduler is never rebuilt
+    _schedule_auto_sync(record_id, schedule_to_save)
 
     return RepositoryInfo(**updated_record)
 
@@ -285,189 +400,263 @@ async def update_repository_auto_sync(
 async def delete_repository(
     record_id: int, 
     background_tasks: BackgroundTasks,
-    db: aiosqlite.Connection = Depends(get_db_session)
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function")
 ):
     """
     Initiates the deletion of a repository's resources in the background.
     """
-    # 1. Check for the record existence to provide immediate feedback to the user.
-    async with db.execute("SELECT id FROM repositories WHERE id = ?", (record_id,)) as cursor:
-        if not await cursor.fetchone():
-            raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
-
-    # 2. Immediately update the status to 'DELETING'
-    await db.execute(
-        "UPDATE repositories SET status = ? WHERE id = ?", 
-        (RepositoryStatus.DELETING.value, record_id)
-    )
+    # 1. Immediately update the status to 'DELETING'.
+    # RETURNING also tells us whether the record exists, to provide immediate feedback to the user.
+    async with db.execute(
+        "UPDATE repositories SET status = ? WHERE id = ? RETURNING pvc_path",
+        (RepositoryStatus.DELETING, record_id)
+    ) as cursor:
+        deleted_record = await cursor.fetchone()
+    if not deleted_record:
+        raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
     await db.commit()
+    _schedule_auto_sync(record_id, None)
 
-    # 3. Add the heavy deletion logic to a background task
-    background_tasks.add_task(worker.perform_cleanup_task, record_id)
+    # 2. Add the heavy deletion logic to a background task
+    background_tasks.add_task(worker.perform_cleanup_task, record_id, deleted_record['pvc_path'])
 
     return {"message": f"Deletion initiated for repository ID {record_id}."}
 
 
 @router.get("/repositories", response_model=list[RepositoryInfo])
 async def list_repositories(
-    db: aiosqlite.Connection = Depends(get_db_session)
+    db: aiosqlite.Connection = Depends(get_read_db_session, scope="function")
 ):
     """
-    Returns a list of all managed (requested) code repositories with dynamically updated statuses.
+    Returns a list of all managed (requested) code repositories.
+    Statuses are read from the DB, which the clone/cleanup tasks keep up to date.
+    The response is encoded in chunks through RepositoryInfo and streamed.
     """
-    async with db.execute("SELECT * FROM repositories ORDER BY created_at DESC") as cursor:
+    async with db.execute(f"SELECT {_REPO_COLUMNS} FROM repositories ORDER BY repositories.created_at DESC") as cursor:
         rows = await cursor.fetchall()
-    
-    repos = [RepositoryInfo(**row) for row in rows]
-
-    # Create a list of tasks to run concurrently
-    tasks = []
-    for repo in repos:
-        # For pending jobs, dynamically query the real-time status from Kubernetes
-        if repo.status == RepositoryStatus.PENDING:
-            tasks.append(update_repo_status(repo))
 
-    # Run status update tasks in parallel
-    if tasks:
-        await asyncio.gather(*tasks)
+    async def generate():
+        yield b"["
+        for start in range(0, len(rows), _STREAM_CHUNK_ROWS):
+            repos = _REPO_LIST_ADAPTER.validate_python(
+                [dict(row) for row in rows[start:start + _STREAM_CHUNK_ROWS]]
+            )
+            # Strip the brackets of the encoded chunk so chunks join into one array
+            chunk = _REPO_LIST_ADAPTER.dump_json(repos)[1:-1]
+            yield (b"," + chunk) if start else chunk
+        yield b"]"
 
-    return repos
-
-
-async def update_repo_status(repo: RepositoryInfo):
-    """
-    Helper function to update a single repository's status in-place.
-    Since we don't rely on Jobs anymore, this mainly handles logic if we wanted to
-    query active execs, but for now we rely on DB status being accurate.
-    """
-    pass
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.get("/repositories/export", response_model=RepositoriesExportResponse)
 async def export_repositories(
-    db: aiosqlite.Connection = Depends(get_db_session)
+    db: aiosqlite.Connection = Depends(get_read_db_session, scope="function")
 ):
     """
     Exports all repositories as JSON for backup or migration purposes.
     Only includes configuration data, not runtime status or logs.
+    The response is encoded straight from the DB rows and streamed in chunks.
     """
-    async with db.execute("SELECT * FROM repositories ORDER BY created_at DESC") as cursor:
-        rows = await cursor.fetchall()
-    
     now = datetime.now(timezone.utc)
-    exports = []
-    
-    for row in rows:
-        # Calculate retention_days from expired_at
-        retention_days = None
-        if row['expired_at']:
-            expired_at = datetime.fromisoformat(row['expired_at'].replace('Z', '+00:00')) if isinstance(row['expired_at'], str) else row['expired_at']
-            # Calculate remaining days from now (rounded up)
-            remaining = (expired_at - now).days
-            retention_days = max(0, remaining)  # Don't export negative days
-        
-        exports.append(RepositoryExport(
-            repo_url=row['repo_url'],
-            commit_id=row['commit_id'],
-            pvc_path=row['pvc_path'],
-            clone_single_branch=row['clone_single_branch'],
-            clone_recursive=row['clone_recursive'],
-            retention_days=retention_days,
-            auto_sync_enabled=row['auto_sync_enabled'],
-            auto_sync_schedule=row['auto_sync_schedule']
-        ))
-    
-    return RepositoriesExportResponse(
-        exported_at=now,
-        repositories=exports
-    )
+    # retention_days is the number of whole days remaining until expired_at,
+    # clamped at 0 (don't export negative days), or NULL for indefinite retention.
+    async with db.execute(
+        """
+        SELECT repo_url, commit_id, pvc_path, clone_single_branch, clone_recursive,
+               CASE WHEN expired_at IS NULL THEN NULL
+                    ELSE MAX(0, CAST(julianday(expired_at) - julianday(?) AS INTEGER))
+               END AS retention_days,
+               auto_sync_enabled, auto_sync_schedule
+        FROM repositories ORDER BY created_at DESC
+        """,
+        (now,)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    async def generate():
+        yield (
+            b'{"version":' + orjson.dumps(_EXPORT_VERSION)
+            + b',"exported_at":' + orjson.dumps(now, option=orjson.OPT_UTC_Z)
+            + b',"repositories":['
+        )
+        for start in range(0, len(rows), _STREAM_CHUNK_ROWS):
+            chunk = b",".join(
+                orjson.dumps({
+                    "repo_url": row['repo_url'],
+                    "commit_id": row['commit_id'],
+                    "pvc_path": row['pvc_path'],
+                    "clone_single_branch": bool(row['clone_single_branch']),
+                    "clone_recursive": bool(row['clone_recursive']),
+                    "retention_days": row['retention_days'],
+                    "auto_sync_enabled": bool(row['auto_sync_enabled']),
+                    "auto_sync_schedule": row['auto_sync_schedule'],
+                })
+                for row in rows[start:start + _STREAM_CHUNK_ROWS]
+            )
+            yield (b"," + chunk) if start else chunk
+        yield b"]}"
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.post("/repositories/import", response_model=RepositoriesImportResponse)
 async def import_repositories(
     req: RepositoriesImportRequest,
     background_tasks: BackgroundTasks,
-    db: aiosqlite.Connection = Depends(get_db_session)
+    db: aiosqlite.Connection = Depends(get_db_session, scope="function")
 ):
     """
     Imports repositories from a JSON export.
     Skips duplicates (existing pvc_path) and reports results for each repository.
     """
-    results: list[RepositoryImportResult] = []
+    results: list[RepositoryImportResult | None] = []
     created_count = 0
     skipped_count = 0
     error_count = 0
-    
+
+    # Check pvc_paths for conflicts in chunks instead of one SELECT per repository
+    existing_by_path = {}
+    pvc_paths = list({repo_export.pvc_path for repo_export in req.repositories})
+    for start in range(0, len(pvc_paths), _IMPORT_LOOKUP_CHUNK):
+        chunk = pvc_paths[start:start + _IMPORT_LOOKUP_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        async with db.execute(
+            f"SELECT id, repo_url, pvc_path FROM repositories WHERE pvc_path IN ({placeholders})",
+            chunk
+        ) as cursor:
+            existing_by_path.update({row['pvc_path']: row for row in await cursor.fetchall()})
+
+    # (index in results, repository) pairs to be inserted
+    to_insert: list[tuple[int, RepositoryExport]] = []
+    seen_paths = set()
     for repo_export in req.repositories:
+        # Checked here rather than in the model, so one bad entry doesn't reject the whole import
         try:
-            # Check if pvc_path already exists
-            async with db.execute(
-                "SELECT id, repo_url FROM repositories WHERE pvc_path = ?", 
-                (repo_export.pvc_path,)
-            ) as cursor:
-                existing = await cursor.fetchone()
-            
-            if existing:
-                results.append(RepositoryImportResult(
-                    pvc_path=repo_export.pvc_path,
-                    status="skipped",
-                    message=f"Already exists (ID: {existing['id']}, URL: {existing['repo_url']})"
-                ))
-                skipped_count += 1
-                continue
-            
+            validate_commit_id(repo_export.commit_id)
+        except ValueError as e:
+            invalid = f"Invalid commit_id: {e}"
+        else:
+            try:
+                if repo_export.auto_sync_enabled:
+                    validate_auto_sync_schedule(repo_export.auto_sync_schedule)
+                invalid = None
+            except ValueError as e:
+                invalid = f"Invalid auto_sync_schedule: {e}"
+        if invalid:
+            results.append(RepositoryImportResult(
+                pvc_path=repo_export.pvc_path,
+                status="error",
+                message=invalid
+            ))
+            error_count += 1
+            continue
+
+        existing = existing_by_path.get(repo_export.pvc_path)
+        if existing:
+            results.append(RepositoryImportResult(
+                pvc_path=repo_export.pvc_path,
+                status="skipped",
+                message=f"Already exists (ID: {existing['id']}, URL: {existing['repo_url']})"
+            ))
+            skipped_count += 1
+        elif repo_export.pvc_path in seen_paths:
+            results.append(RepositoryImportResult(
+                pvc_path=repo_export.pvc_path,
+                status="skipped",
+                message="Duplicate pvc_path in the import request"
+            ))
+            skipped_count += 1
+        else:
+            seen_paths.add(repo_export.pvc_path)
+            to_insert.append((len(results), repo_export))
+            results.append(None)
+
+    if to_insert:
+        now = datetime.now(timezone.utc)
+        rows = []
+        for _, repo_export in to_insert:
             # Calculate expired_at from retention_days
             expired_at = None
             if repo_export.retention_days is not None and repo_export.retention_days > 0:
-                expired_at = datetime.now(timezone.utc) + timedelta(days=repo_export.retention_days)
-            
-            # Insert new repository
-            async with db.execute(
+                expired_at = now + timedelta(days=repo_export.retention_days)
+            rows.append((
+                repo_export.repo_url, repo_export.commit_id, RepositoryStatus.PENDING,
+                "IMPORT", repo_export.pvc_path, expired_at,
+                repo_export.clone_single_branch, repo_export.clone_recursive,
+                now,
+                repo_export.auto_sync_enabled,
+                repo_export.auto_sync_schedule if repo_export.auto_sync_enabled else None
+            ))
+
+        new_paths = [repo_export.pvc_path for _, repo_export in to_insert]
+        try:
+            # Insert all new repositories in one transaction (a single commit/fsync).
+            # Rows conflicting on (repo_url, commit_id) are ignored and reported below.
+            await db.execute("BEGIN IMMEDIATE")
+            await db.executemany(
                 """
-                INSERT INTO repositories (
+                INSERT OR IGNORE INTO repositories (
                     repo_url, commit_id, status, job_name, pvc_path, expired_at, 
                     clone_single_branch, clone_recursive, last_synced_at,
                     auto_sync_enabled, auto_sync_schedule
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    repo_export.repo_url, repo_export.commit_id, RepositoryStatus.PENDING.value, 
-                    "IMPORT", repo_export.pvc_path, expired_at,
-                    repo_export.clone_single_branch, repo_export.clone_recursive,
-                    datetime.now(timezone.utc),
-                    repo_export.auto_sync_enabled,
-                    repo_export.auto_sync_schedule if repo_export.auto_sync_enabled else None
-                )
-            ) as cursor:
-                await db.commit()
-                record_id = cursor.lastrowid
-            
-            # Add background task to clone repository
-            background_tasks.add_task(
-                worker.perform_clone_task,
-                record_id=record_id,
-                repo_url=repo_export.repo_url,
-                pvc_path=repo_export.pvc_path,
-                commit_id=repo_export.commit_id,
-                single_branch=repo_export.clone_single_branch,
-                recursive=repo_export.clone_recursive
+                rows
             )
-            
-            results.append(RepositoryImportResult(
-                pvc_path=repo_export.pvc_path,
-                status="created",
-                message=f"Import initiated (ID: {record_id})"
-            ))
-            created_count += 1
-            
+            inserted_ids = {}
+            for start in range(0, len(new_paths), _IMPORT_LOOKUP_CHUNK):
+                chunk = new_paths[start:start + _IMPORT_LOOKUP_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                async with db.execute(
+                    f"SELECT id, pvc_path FROM repositories WHERE pvc_path IN ({placeholders})",
+                    chunk
+                ) as cursor:
+                    inserted_ids.update({row['pvc_path']: row['id'] for row in await cursor.fetchall()})
+            await db.commit()
         except Exception as e:
-            logger.error(f"Error importing repository {repo_export.pvc_path}: {e}")
-            results.append(RepositoryImportResult(
-                pvc_path=repo_export.pvc_path,
-                status="error",
-                message=str(e)
-            ))
-            error_count += 1
+            await db.rollback()
+            logger.error(f"Error importing repositories: {e}")
+            for index, repo_export in to_insert:
+                results[index] = RepositoryImportResult(
+                    pvc_path=repo_export.pvc_path,
+                    status="error",
+                    message=str(e)
+                )
+            error_count += len(to_insert)
+        else:
+            for index, repo_export in to_insert:
+                record_id = inserted_ids.get(repo_export.pvc_path)
+                if record_id is None:
+                    logger.error(f"Error importing repository {repo_export.pvc_path}: duplicate repository and commit ID")
+                    results[index] = RepositoryImportResult(
+                        pvc_path=repo_export.pvc_path,
+                        status="error",
+                        message="This repository and commit ID combination already exists."
+                    )
+                    error_count += 1
+                    continue
+
+                if repo_export.auto_sync_enabled:
+                    _schedule_auto_sync(record_id, repo_export.auto_sync_schedule)
+
+                # Add background task to clone repository
+                background_tasks.add_task(
+                    worker.perform_clone_task,
+                    record_id=record_id,
+                    repo_url=repo_export.repo_url,
+                    pvc_path=repo_export.pvc_path,
+                    commit_id=repo_export.commit_id,
+                    single_branch=repo_export.clone_single_branch,
+                    recursive=repo_export.clone_recursive
+                )
+
+                results[index] = RepositoryImportResult(
+                    pvc_path=repo_export.pvc_path,
+                    status="created",
+                    message=f"Import initiated (ID: {record_id})"
+                )
+                created_count += 1
     
     logger.info(f"Import completed: {created_count} created, {skipped_count} skipped, {error_count} errors")
     
@@ -480,18 +669,17 @@ async def import_repositories(
     )
 
 @router.get("/repository/{record_id}/logs", response_model=JobLogs)
-async def get_repository_logs(
-    record_id: int,
-    db: aiosqlite.Connection = Depends(get_db_session)
-):
+async def get_repository_logs(record_id: int):
     """
     Retrieves logs for the pod associated with a repository's job.
     - For standard statuses, it fetches logs from the clone/sync job.
     - For 'DELETING' or 'DELETION_FAILED' statuses, it fetches logs from the cleanup job.
     """
-    # 1. Get repository info from DB
-    async with db.execute("SELECT job_name, pvc_path, status, task_log FROM repositories WHERE id = ?", (record_id,)) as cursor:
-        record = await cursor.fetchone()
+    # 1. Get repository info from DB. The read connection is returned to the pool right away,
+    # since reading the live log below can wait for a running clone to release K8S_EXEC_LOCK.
+    async with pool.reader() as db:
+        async with db.execute("SELECT job_name, pvc_path, status, task_log FROM repositories WHERE id = ?", (record_id,)) as cursor:
+            record = await cursor.fetchone()
     if not record:
         raise HTTPException(status_code=404, detail=f"Repository with ID {record_id} not found.")
 
@@ -505,10 +693,8 @@ async def get_repository_logs(
         return {"logs": task_log}
     
     # 3. If in progress, try to read the real-time log from the pod
-    if repo_status in [RepositoryStatus.PENDING.value, RepositoryStatus.CLONING.value, RepositoryStatus.POD_CREATING.value, RepositoryStatus.DELETING.value]:
-        log_file = f"/tmp/task-log-{pvc_path}.txt"
-        async with K8S_EXEC_LOCK:
-            live_logs = await asyncio.to_thread(k8s.exec_read_file, log_file)
+    if repo_status in _IN_PROGRESS_STATUSES:
+        live_logs = await _read_live_log(pvc_path)
         if live_logs:
             return {"logs": live_logs}
         
@@ -516,32 +702,45 @@ async def get_repository_logs(
 
     return {"logs": "No logs available for this repository."}
 
+@async_ttl_cache(ttl=1.0)
+async def _read_live_log(pvc_path: str) -> str:
+    """
+    Reads the in-progress task log from the OpenGrok pod.
+    Cached briefly so that clients polling the same repository share one exec.
+    """
+    log_file = f"/tmp/task-log-{pvc_path}.txt"
+    async with K8S_EXEC_LOCK:
+        return await asyncio.to_thread(k8s.exec_read_file, log_file)
+
+
 async def cleanup_expired_repositories():
     """
     Scheduled job to find and delete expired repositories.
     """
     logger.info("Running scheduled job: cleanup_expired_repositories")
-    db = None
-    try:
-        # We need a separate DB connection for the background task
-        db = await aiosqlite.connect(DB_PATH, factory=custom_connection_factory)
-        
-        # Find repositories where expired_at is in the past
+    async with pool.write() as db:
+        # Mark all expired repositories as DELETING in one statement.
+        # Rows already being deleted are skipped so they are not cleaned up twice.
         now_utc = datetime.now(timezone.utc)
-        async with db.execute("SELECT id FROM repositories WHERE expired_at IS NOT NULL AND expired_at < ?", (now_utc,)) as cursor:
+        async with db.execute(
+            "UPDATE repositories SET status = ? "
+            "WHERE expired_at IS NOT NULL AND expired_at < ? AND status != ? RETURNING id, pvc_path",
+            (RepositoryStatus.DELETING, now_utc, RepositoryStatus.DELETING)
+        ) as cursor:
             expired_repos = await cursor.fetchall()
+        await db.commit()
 
-        if not expired_repos:
-            logger.info("No expired repositories found.")
-            return
+    if not expired_repos:
+        logger.info("No expired repositories found.")
+        return
 
-        logger.info(f"Found {len(expired_repos)} expired repositories to delete.")
-        for repo in expired_repos:
-            # Trigger cleanup directly (fire and forget in background loop)
-            asyncio.create_task(worker.perform_cleanup_task(repo['id']))
-    finally:
-        if db:
-            await db.close()
+    logger.info(f"Found {len(expired_repos)} expired repositories to delete.")
+    for repo in expired_repos:
+        _schedule_auto_sync(repo['id'], None)
+    # Remove all expired repositories in the background with a single exec and commit
+    asyncio.create_task(worker.perform_bulk_cleanup_task(
+        [(repo['id'], repo['pvc_path']) for repo in expired_repos]
+    ))
 
 
 @router.get("/opengrok/status", response_model=OpenGrokStatusResponse)
@@ -549,7 +748,16 @@ async def get_opengrok_status():
     """
     Retrieves the status, resource usage, and deployment info of OpenGrok.
     """
-    resources = k8s.get_opengrok_resources()
+    return await _fetch_opengrok_snapshot()
+
+
+@async_ttl_cache(ttl=2.0)
+async def _fetch_opengrok_snapshot() -> OpenGrokStatusResponse:
+    """
+    Builds the OpenGrok status from Kubernetes.
+    Cached briefly so that dashboards polling concurrently share one set of K8s calls.
+    """
+    resources = await asyncio.to_thread(k8s.get_opengrok_resources)
     deployment = resources.get("deployment")
     pod_list = resources.get("pods", [])
 
@@ -566,11 +774,15 @@ async def get_opengrok_status():
             updated_replicas=status.updated_replicas or 0,
         )
 
+    # Fetch metrics for all pods with a single Metrics API call
+    all_metrics = await asyncio.to_thread(k8s.list_opengrok_pod_metrics) if pod_list else {}
+    unavailable_metrics = {"cpu": "N/A", "memory": "N/A"}
+
     pod_statuses = []
     for pod in pod_list:
         # Create a status object for each pod
         pod_name = pod.metadata.name
-        metrics = k8s.get_pod_metrics(pod_name)
+        metrics = all_metrics.get(pod_name, unavailable_metrics)
         async with K8S_EXEC_LOCK:
             storage_list_of_dicts = await asyncio.to_thread(k8s.get_storage_usage, pod_name)
         
@@ -599,6 +811,45 @@ async def get_opengrok_logs(pod_name: str, tail_lines: int = 500):
     # The pod_name is now a required query parameter, so we don't need to find the pod first.
     # We directly request the logs for the given pod name.
     # tail_lines can be adjusted via query parameter.
-    logs = k8s.get_pod_logs(pod_name, tail_lines=tail_lines)
+    if tail_lines > _LOG_STREAM_MIN_LINES:
+        try:
+            resp = await asyncio.to_thread(k8s.get_pod_logs_stream, pod_name, tail_lines)
+        except ApiException as e:
+            logger.error(f"K8s API error when fetching logs for pod {pod_name}: {e}")
+            return JobLogs(logs=f"Error fetching logs from Kubernetes: {e.reason}")
+        return StreamingResponse(_iter_logs_json(resp), media_type="application/json")
+
+    try:
+        logs = await _read_pod_logs(pod_name, tail_lines)
+    except ApiException as e:
+        # Raised through the cache, so the failure isn't served to other viewers for its TTL
+        logger.error(f"K8s API error when fetching logs for pod {pod_name}: {e}")
+        return JobLogs(logs=f"Error fetching logs from Kubernetes: {e.reason}")
     
     return JobLogs(logs=logs)
+
+
+def _iter_logs_json(resp):
+    """
+    Encodes a streamed pod log response as a JobLogs JSON body, chunk by chunk.
+    A sync generator, so StreamingResponse iterates the blocking reads in a thread.
+    """
+    # Chunks can split a multi-byte character, so decode incrementally
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        yield b'{"logs":"'
+        for chunk in resp.stream(8192):
+            yield orjson.dumps(decoder.decode(chunk))[1:-1]
+        yield orjson.dumps(decoder.decode(b"", final=True))[1:-1] + b'"}'
+    finally:
+        resp.release_conn()
+
+
+@async_ttl_cache(ttl=5.0)
+async def _read_pod_logs(pod_name: str, tail_lines: int) -> str:
+    """
+    Reads the tail of a pod's logs from Kubernetes.
+    Cached briefly so that viewers polling the same pod share one API call.
+    API errors are raised rather than returned, so they are not cached.
+    """
+    return await asyncio.to_thread(k8s.get_pod_logs, pod_name, tail_lines=tail_lines)
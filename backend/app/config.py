@@ -15,7 +15,13 @@ SSH_MOUNT_PATH = "/root/.ssh"
 
 # --- Database ---
 DB_PATH = "/data/manager.db"
+DB_READERS = 4 # Read-only connections in the pool; SQLite reads are short, so a few are enough
 
 # --- Worker ---
 WATCH_INTERVAL_SEC = 5
-AUTO_SYNC_INTERVAL_SEC = 60 # Check for scheduled syncs every 60 seconds
+EXPIRED_CLEANUP_INTERVAL_SEC = 3600 # How often repositories past their expiration are removed
+REINDEX_DEBOUNCE_SEC = 5 # Reindex requests within this window are sent as one trigger
+
+# --- K8s Exec ---
+EXEC_SESSION_IDLE_SEC = 300 # Close persistent exec shells unused for this long
+CLEANUP_EXEC_TIMEOUT_SEC = 600 # Upper bound for 'rm -rf' of a repository over an exec session
@@ -1,7 +1,24 @@
+import asyncio
 import aiosqlite
 import sqlite3
+from contextlib import asynccontextmanager
 
-from .config import DB_PATH
+from .config import DB_PATH, DB_READERS
+
+# WAL lets readers proceed while a write is in progress. It is persisted in the DB
+# file, so it only needs to be set once per file per process.
+WAL_PRAGMA = "PRAGMA journal_mode=WAL"
+_wal_enabled_files: set[str] = set()
+
+# Applied to every new connection. NORMAL synchronous is safe under WAL while
+# fsyncing far less often.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # ~64MB page cache
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=268435456",
+)
 
 def custom_connection_factory(database, **kwargs):
     """
@@ -10,26 +27,104 @@ def custom_connection_factory(database, **kwargs):
     It needs to accept the 'database' argument passed from sqlite3.connect
     and '**kwargs' (which includes 'factory' itself).
     """
-    # Ignoring kwargs, it uses the passed 'database' path
-    # to call the standard sqlite3.connect.
-    conn = sqlite3.connect(database)
+    # Only 'uri' is honored from kwargs (needed for read-only 'file:...?mode=ro' URIs),
+    # the passed 'database' path is used to call the standard sqlite3.connect.
+    uri = kwargs.get("uri", False)
+    conn = sqlite3.connect(database, uri=uri)
+    read_only = uri and "mode=ro" in database
     
     # Set connection properties here
     conn.row_factory = sqlite3.Row
+    # journal_mode cannot be changed by a read-only connection
+    if not read_only and database not in _wal_enabled_files:
+        conn.execute(WAL_PRAGMA)
+        _wal_enabled_files.add(database)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+
+class AioSqlitePool:
+    """
+    One write connection plus a fixed-size pool of read-only aiosqlite connections.
+    SQLite allows a single writer at a time, so writes are serialized on an asyncio.Lock;
+    with WAL enabled, reads on the reader connections are not blocked by in-flight writes.
+    """
+
+    def __init__(self, db_path: str, readers: int):
+        self.db_path = db_path
+        self.size = readers
+        self.writer: aiosqlite.Connection | None = None
+        self.write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue | None = None
+
+    async def open(self):
+        # Open the writer first so WAL is enabled before the read-only connections attach
+        self.writer = await aiosqlite.connect(self.db_path, factory=custom_connection_factory)
+        self._readers = asyncio.Queue()
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, factory=custom_connection_factory
+            )
+            self._readers.put_nowait(conn)
+
+    async def close(self):
+        if self._readers is not None:
+            while not self._readers.empty():
+                await self._readers.get_nowait().close()
+            self._readers = None
+        if self.writer is not None:
+            async with self.write_lock:
+                await self.writer.close()
+            self.writer = None
+
+    @asynccontextmanager
+    async def reader(self):
+        """Waits for an idle read connection and returns it to the pool afterwards."""
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def write(self):
+        """
+        Holds the write lock and yields the write connection.
+        The connection is shared, so an uncommitted transaction is rolled back on error
+        instead of leaking into the next writer.
+        """
+        async with self.write_lock:
+            try:
+                yield self.writer
+            except BaseException:
+                await self.writer.rollback()
+                raise
+
+
+pool = AioSqlitePool(DB_PATH, readers=DB_READERS)
+
 # -------------------------------------------------------------
 # DB Session for API Requests (Dependency Injection)
 # -------------------------------------------------------------
 async def get_db_session():
     """
-    DB session for FastAPI's Dependency Injection.
-    Connects at the start of an API request and automatically closes at the end.
+    Read-write DB session for FastAPI's Dependency Injection.
+    Holds the pool's write connection (and its lock) while the endpoint runs.
+    Must be declared with Depends(..., scope="function"): the default request scope only
+    exits after the response is sent, but BackgroundTasks run as part of the response
+    and take the write lock themselves.
+    """
+    async with pool.write() as db:
+        yield db
+
+
+async def get_read_db_session():
+    """
+    Read-only DB session for FastAPI's Dependency Injection.
+    Borrows a connection from the read pool while the endpoint runs. Declare it with
+    Depends(..., scope="function") so the connection is returned before the response is sent.
+    Endpoints that wait on anything slow should use pool.reader() around their queries instead.
     """
-    db = None
-    try:
-        db = await aiosqlite.connect(DB_PATH, factory=custom_connection_factory)
-        yield db 
-    finally:
-        if db:
-            await db.close()
+    async with pool.reader() as db:
+        yield db
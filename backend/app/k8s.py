@@ -1,9 +1,16 @@
 import re
-import hashlib
+import atexit
+import functools
 import time
+import uuid
+import shlex
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from kubernetes import client, config
+import orjson
+import urllib3
+from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
 from kubernetes.stream import stream
 
@@ -11,12 +18,16 @@ from .schemas import RepositoryStatus
 from .config import (
     POD_NAMESPACE,
     PVC_NAME,
+    EXEC_SESSION_IDLE_SEC,
+    CLEANUP_EXEC_TIMEOUT_SEC,
 )
 
 logger = logging.getLogger(f"uvicorn.{__name__}")
 
 # --- K8s API Client ---
-def get_k8s_clients():
+# Config and clients are created on first use, so importing this module does no I/O.
+@functools.lru_cache(maxsize=1)
+def _ensure_config() -> bool:
     try:
         config.load_incluster_config()
     except config.ConfigException:
@@ -24,44 +35,304 @@ def get_k8s_clients():
             config.load_kube_config()
         except config.ConfigException:
             logger.warning("Could not load Kubernetes config. K8s features will be unavailable.")
-            return None, None, None, None
-    
-    return (
-        client.BatchV1Api(),
-        client.CoreV1Api(),
-        client.AppsV1Api(),
-        client.CustomObjectsApi()
-    )
+            return False
+
+    # K8s calls run in worker threads, so allow enough pooled connections for them to reuse
+    configuration = client.Configuration.get_default_copy()
+    configuration.connection_pool_maxsize = 32
+    client.Configuration.set_default(configuration)
+    return True
+
+@functools.lru_cache(maxsize=1)
+def _get_core_v1() -> client.CoreV1Api:
+    _ensure_config()
+    return client.CoreV1Api()
+
+@functools.lru_cache(maxsize=1)
+def _get_apps_v1() -> client.AppsV1Api:
+    _ensure_config()
+    return client.AppsV1Api()
+
+@functools.lru_cache(maxsize=1)
+def _get_custom_objects() -> client.CustomObjectsApi:
+    _ensure_config()
+    return client.CustomObjectsApi()
+
 
-batch_v1_api, core_v1_api, apps_v1_api, custom_objects_api = get_k8s_clients() or (None, None, None, None)
+# Statuses worth retrying: throttling and server errors. The client raises status 0 for SSL errors.
+# Refused or reset connections and timeouts are not ApiExceptions; they surface as
+# the urllib3 errors below and are retried as well. Other urllib3 errors are not.
+_TRANSIENT_API_STATUSES = frozenset({0, 429, 500, 502, 503, 504})
+_TRANSIENT_URLLIB3_ERRORS = (
+    urllib3.exceptions.MaxRetryError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.NewConnectionError,
+    urllib3.exceptions.TimeoutError,
+)
+
+def _backoff_delay(attempt: int, base: float = 0.1, cap: float = 2.0) -> float:
+    """Capped exponential backoff: base * 2**attempt, never more than cap seconds."""
+    return min(cap, base * 2 ** attempt)
 
+def _call_with_backoff(func, *args, max_wait: float = 10.0, **kwargs):
+    """
+    Calls a K8s API function, retrying transient errors with capped exponential backoff.
+    Gives up (re-raising the last error) once the next wait would pass `max_wait` seconds.
+    """
+    deadline = time.monotonic() + max_wait
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except (ApiException, *_TRANSIENT_URLLIB3_ERRORS) as e:
+            delay = _backoff_delay(attempt)
+            transient = not isinstance(e, ApiException) or e.status in _TRANSIENT_API_STATUSES
+            if not transient or time.monotonic() + delay > deadline:
+                raise
+            reason = e.status if isinstance(e, ApiException) else type(e).__name__
+            logger.warning(f"Transient K8s API error ({reason}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
 
 # --- Helper Functions ---
+# Maps every Latin-1 character outside [a-z0-9-] to '-' in one str.translate pass
+_DNS_ALLOWED = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-")
+_DNS_TRANS = str.maketrans({chr(i): '-' for i in range(256) if chr(i) not in _DNS_ALLOWED})
+_DNS_INVALID_RE = re.compile(r'[^a-z0-9-]')
+_DASH_RUN_RE = re.compile(r'-+')
+
+@functools.lru_cache(maxsize=1024)
 def sanitize_for_dns(text: str) -> str:
     """Sanitize a string to be usable as a K8s resource name."""
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9-]', '-', text)
-    text = re.sub(r'-+', '-', text)
-    return text.strip('-')
+    text = text.lower().translate(_DNS_TRANS)
+    # The table only covers Latin-1; anything beyond it goes through the regex
+    if not text.isascii():
+        text = _DNS_INVALID_RE.sub('-', text)
+    return _DASH_RUN_RE.sub('-', text).strip('-')
+
+OPENGROK_LABEL_SELECTOR = "app.kubernetes.io/component=opengrok"
+
+
+class OpenGrokPodCache:
+    """
+    In-memory view of the OpenGrok pods and their phases, kept current by a background watch.
+    Lets pod-name lookups skip a list call to the API server before every exec.
+    """
+
+    def __init__(self, label_selector: str):
+        self.label_selector = label_selector
+        self._pods: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._watch: watch.Watch | None = None
+
+    @property
+    def is_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def start(self):
+        """Starts the watch thread on first call; later calls are no-ops."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="opengrok-pod-watch", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def running_pod_name(self) -> str | None:
+        with self._lock:
+            return next((name for name, phase in self._pods.items() if phase == "Running"), None)
+
+    def _relist(self) -> str:
+        """Replaces the cached pods with a fresh list and returns its resourceVersion."""
+        resp = _call_with_backoff(
+            _get_core_v1().list_namespaced_pod,
+            namespace=POD_NAMESPACE,
+            label_selector=self.label_selector,
+            _preload_content=False
+        )
+        data = orjson.loads(resp.data)
+        pods = {
+            item["metadata"]["name"]: item.get("status", {}).get("phase")
+            for item in data.get("items", [])
+        }
+        with self._lock:
+            self._pods = pods
+        self._synced.set()
+        return data["metadata"]["resourceVersion"]
+
+    def _run(self):
+        resource_version = None
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._relist()
+                    failures = 0
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                    _get_core_v1().list_namespaced_pod,
+                    namespace=POD_NAMESPACE,
+                    label_selector=self.label_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=300
+                ):
+                    raw = event["raw_object"]
+                    name = raw["metadata"]["name"]
+                    resource_version = raw["metadata"]["resourceVersion"]
+                    with self._lock:
+                        if event["type"] == "DELETED":
+                            self._pods.pop(name, None)
+                        else:
+                            self._pods[name] = raw.get("status", {}).get("phase")
+            except Exception as e:
+                # 410 Gone means our resourceVersion is too old; any other error may have
+                # left the cache stale. Either way fall back to direct lookups and relist.
+                if not (isinstance(e, ApiException) and e.status == 410):
+                    logger.warning(f"OpenGrok pod watch interrupted, relisting: {e}")
+                    self._synced.clear()
+                    self._stopped.wait(_backoff_delay(failures, base=0.5, cap=30.0))
+                    failures += 1
+                resource_version = None
+
+
+_pod_cache = OpenGrokPodCache(OPENGROK_LABEL_SELECTOR)
+atexit.register(_pod_cache.stop)
 
 def get_opengrok_pod_name() -> str:
     """
     Finds a running OpenGrok pod name.
+    Served from the watch cache when it is synced, otherwise from a direct list call.
     """
-    label_selector = "app.kubernetes.io/component=opengrok"
+    _pod_cache.start()
+    if _pod_cache.is_synced:
+        pod_name = _pod_cache.running_pod_name()
+        if not pod_name:
+            raise Exception("No running OpenGrok pod found.")
+        return pod_name
+
     try:
-        pod_list = core_v1_api.list_namespaced_pod(
+        # Only the name is needed, so skip deserializing the response into V1Pod models
+        resp = _call_with_backoff(
+            _get_core_v1().list_namespaced_pod,
             namespace=POD_NAMESPACE,
-            label_selector=label_selector,
-            field_selector="status.phase=Running"
+            label_selector=OPENGROK_LABEL_SELECTOR,
+            field_selector="status.phase=Running",
+            _preload_content=False
         )
-        if not pod_list.items:
+        items = orjson.loads(resp.data).get("items")
+        if not items:
             raise Exception("No running OpenGrok pod found.")
-        return pod_list.items[0].metadata.name
+        return items[0]["metadata"]["name"]
     except ApiException as e:
         logger.error(f"K8s API error when searching for OpenGrok pod: {e}")
         raise
 
+class K8sExecSession:
+    """
+    A long-lived '/bin/sh' exec stream in a pod, reused for short commands.
+    Avoids paying the websocket/TLS handshake for every log poll, df or rm.
+    """
+
+    def __init__(self, pod_name: str):
+        self.pod_name = pod_name
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._ws = stream(
+            _get_core_v1().connect_get_namespaced_pod_exec,
+            pod_name,
+            POD_NAMESPACE,
+            command=["/bin/sh"],
+            stderr=True, stdin=True, stdout=True, tty=False,
+            _preload_content=False
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self._ws.is_open()
+
+    def run(self, command: str, timeout: float = 10.0) -> tuple[int, str]:
+        """Runs a shell command and returns its exit code and stdout."""
+        marker = f"__crpaas_done_{uuid.uuid4().hex}__"
+        sentinel = f"\n{marker} "
+        with self._lock:
+            self.last_used = time.monotonic()
+            # The extra newline before the marker keeps it on its own line even when
+            # the command output has no trailing newline; it is stripped again below.
+            self._ws.write_stdin(f"{command}; printf '\\n%s %d\\n' '{marker}' \"$?\"\n")
+            # Chunks are joined once at the end; the sentinel is searched for only in
+            # the tail, so long outputs are not rescanned on every read.
+            chunks = []
+            tail = ""
+            found = done = False
+            deadline = time.monotonic() + timeout
+            while not done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._ws.is_open():
+                    raise TimeoutError(f"No response from exec session in {self.pod_name}")
+                self._ws.update(timeout=remaining)
+                if self._ws.peek_stdout():
+                    chunk = self._ws.read_stdout()
+                    chunks.append(chunk)
+                    tail = tail[-len(sentinel):] + chunk
+                    found = found or sentinel in tail
+                    # The status line after the sentinel is complete once a newline arrives
+                    done = found and chunk.endswith("\n")
+                if self._ws.peek_stderr():
+                    self._ws.read_stderr()
+            body, _, status = "".join(chunks).rpartition(sentinel)
+            return int(status), body
+
+    def close(self):
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+_exec_sessions: dict[str, K8sExecSession] = {}
+_exec_sessions_lock = threading.Lock()
+
+def _get_exec_session(pod_name: str) -> K8sExecSession:
+    """
+    Returns the open exec session for a pod, creating it if needed.
+    Sessions idle for longer than EXEC_SESSION_IDLE_SEC are closed on the way.
+    """
+    now = time.monotonic()
+    with _exec_sessions_lock:
+        for name, session in list(_exec_sessions.items()):
+            if not session.is_open or now - session.last_used > EXEC_SESSION_IDLE_SEC:
+                session.close()
+                del _exec_sessions[name]
+        session = _exec_sessions.get(pod_name)
+        if session is None:
+            session = K8sExecSession(pod_name)
+            _exec_sessions[pod_name] = session
+        return session
+
+def _drop_exec_session(pod_name: str):
+    with _exec_sessions_lock:
+        session = _exec_sessions.pop(pod_name, None)
+    if session:
+        session.close()
+
+def _run_in_pod(pod_name: str, command: str, timeout: float = 10.0) -> tuple[int, str]:
+    """
+    Runs a shell command over the pod's persistent exec session.
+    The session is dropped on errors so the next call reconnects.
+    """
+    try:
+        return _get_exec_session(pod_name).run(command, timeout=timeout)
+    except Exception:
+        _drop_exec_session(pod_name)
+        raise
+
+
 def exec_clone_repository(repo_url: str, pvc_path: str, commit_id: str, single_branch: bool, recursive: bool) -> tuple[bool, str]:
     """
     Executes the git clone/pull script directly inside the OpenGrok pod.
@@ -103,24 +374,32 @@ def exec_clone_repository(repo_url: str, pvc_path: str, commit_id: str, single_b
         
         logger.info(f"Execing into {pod_name}: {exec_command}")
         
-        # Use stream with stderr=True to capture all output
-        resp = stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
+        # Keep the websocket open ourselves so output is drained as it arrives and the
+        # exit code can be read from the error channel once the command finishes
+        ws = stream(
+            _get_core_v1().connect_get_namespaced_pod_exec,
             pod_name,
             POD_NAMESPACE,
             command=exec_command,
-            stderr=True, stdin=False, stdout=True, tty=False
+            stderr=True, stdin=False, stdout=True, tty=False,
+            _preload_content=False
         )
+        chunks = []
+        try:
+            while ws.is_open():
+                ws.update(timeout=1)
+                if ws.peek_stdout():
+                    chunks.append(ws.read_stdout())
+                if ws.peek_stderr():
+                    chunks.append(ws.read_stderr())
+            # Parsed from the error channel: {"status": "Success"} or a Failure with an ExitCode cause
+            exit_code = ws.returncode
+        finally:
+            ws.close()
+        resp = "".join(chunks)
         
-        # stream() returns the output string. It throws ApiException on failure if checking response code?
-        # Actually stream() usually just returns output. To check exit code, we might need a different approach 
-        # or rely on the fact that the script has 'set -eu' and creates output.
-        # But wait, stream() doesn't return exit code directly easily unless we use the WebSocket client directly.
-        # However, for 'set -eu', if it fails, it usually writes to stderr.
-        # Let's assume if it throws exception it failed.
-        
-        logger.info(f"Exec output: {resp}")
-        return True, resp
+        logger.info(f"Exec finished with exit code {exit_code}. Output: {resp}")
+        return exit_code == 0, resp
 
     except ApiException as e:
         logger.error(f"K8s Exec API error: {e}")
@@ -139,21 +418,12 @@ def exec_cleanup_repository(pvc_path: str) -> bool:
         log_file = f"/tmp/task-log-{pvc_path}.txt"
         
         # Cleanup log just for consistency, though usually fast.
-        cmd = f"rm -rf '{target_dir}'"
-        wrapped_cmd = f"set -o pipefail; {cmd} 2>&1 | tee {log_file}"
+        cmd = f"rm -rf -- {shlex.quote(target_dir)} > {shlex.quote(log_file)} 2>&1"
         
-        exec_command = ["/bin/bash", "-c", wrapped_cmd]
-        
-        logger.info(f"Execing cleanup into {pod_name}: {exec_command}")
+        logger.info(f"Execing cleanup into {pod_name}: {cmd}")
         
-        stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
-            pod_name,
-            POD_NAMESPACE,
-            command=exec_command,
-            stderr=True, stdin=False, stdout=True, tty=False
-        )
-        return True
+        exit_code, _ = _run_in_pod(pod_name, cmd, timeout=CLEANUP_EXEC_TIMEOUT_SEC)
+        return exit_code == 0
     except Exception as e:
         logger.error(f"Cleanup exec failed: {e}")
         return False
@@ -161,50 +431,49 @@ def exec_cleanup_repository(pvc_path: str) -> bool:
 def exec_read_file(file_path: str) -> str:
     """
     Executes 'cat <file_path>' in the OpenGrok pod to read logs or content.
+    Runs over a persistent exec session so repeated polls reuse one connection.
     """
     try:
         pod_name = get_opengrok_pod_name()
-        exec_command = ["/bin/cat", file_path]
-        
-        resp = stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
-            pod_name,
-            POD_NAMESPACE,
-            command=exec_command,
-            stderr=True, stdin=False, stdout=True, tty=False
-        )
-        return resp
+        _, output = _run_in_pod(pod_name, f"cat {shlex.quote(file_path)} 2>/dev/null")
+        return output
     except Exception as e:
-        # It's expected to fail if file doesn't exist yet (start of clone)
+        # It's expected to be empty if file doesn't exist yet (start of clone)
         return ""
 
 
 # --- OpenGrok Monitoring ---
+_list_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="k8s-list")
 
 def get_opengrok_resources() -> dict:
     """
     Finds and returns OpenGrok's Deployment and associated running Pods.
     Returns a dictionary with 'deployment' and 'pods' keys.
     """
-    label_selector = "app.kubernetes.io/component=opengrok"
+    label_selector = OPENGROK_LABEL_SELECTOR
     try:
-        # 1. Find the OpenGrok Deployment
-        deployment_list = apps_v1_api.list_namespaced_deployment(
+        # The Deployment and its running Pods are listed concurrently
+        deployment_future = _list_executor.submit(
+            _call_with_backoff,
+            _get_apps_v1().list_namespaced_deployment,
             namespace=POD_NAMESPACE,
             label_selector=label_selector
         )
+        pod_future = _list_executor.submit(
+            _call_with_backoff,
+            _get_core_v1().list_namespaced_pod,
+            namespace=POD_NAMESPACE,
+            label_selector=label_selector,
+            field_selector="status.phase=Running" # Only get running pods
+        )
+        deployment_list = deployment_future.result()
+        pod_list = pod_future.result()
+
         if not deployment_list.items:
             logger.warning("No OpenGrok Deployment found.")
             return {"deployment": None, "pods": []}
         
         deployment = deployment_list.items[0]
-
-        # 2. Find running Pods for that Deployment
-        pod_list = core_v1_api.list_namespaced_pod(
-            namespace=POD_NAMESPACE,
-            label_selector=label_selector,
-            field_selector="status.phase=Running" # Only get running pods
-        )
         if not pod_list.items:
             logger.warning("No running OpenGrok pod found.")
         
@@ -214,45 +483,62 @@ def get_opengrok_resources() -> dict:
         logger.error(f"K8s API error when searching for OpenGrok resources: {e}")
         return {"deployment": None, "pods": []}
 
-def get_pod_metrics(pod_name: str) -> dict:
+def list_opengrok_pod_metrics() -> dict[str, dict]:
     """
-    Retrieves CPU and Memory usage for a specific pod using the Metrics API.
-    Returns a dictionary with 'cpu' and 'memory' usage, or 'N/A' if not available.
+    Retrieves CPU and Memory usage for all OpenGrok pods with a single Metrics API call.
+    Returns a dictionary keyed by pod name, each value holding 'cpu' and 'memory' usage.
+    Pods without metrics are absent from the result.
     Requires the Kubernetes Metrics Server to be installed in the cluster.
     """
     try:
-        metrics = custom_objects_api.get_namespaced_custom_object(
+        metrics_list = _get_custom_objects().list_namespaced_custom_object(
             group="metrics.k8s.io",
             version="v1beta1",
             namespace=POD_NAMESPACE,
             plural="pods",
-            name=pod_name
+            label_selector=OPENGROK_LABEL_SELECTOR
         )
-        # Assuming the main container is the first one
-        if metrics.get('containers'):
-            usage = metrics['containers'][0]['usage']
-            return {"cpu": usage.get('cpu', 'N/A'), "memory": usage.get('memory', 'N/A')}
-        return {"cpu": "N/A", "memory": "N/A"}
     except ApiException as e:
         if e.status == 404:
-            logger.warning(f"Metrics for pod {pod_name} not found. Is Metrics Server installed?")
+            logger.warning("Pod metrics not found. Is Metrics Server installed?")
         else:
-            logger.error(f"K8s Metrics API error for pod {pod_name}: {e}")
-        return {"cpu": "N/A", "memory": "N/A"}
+            logger.error(f"K8s Metrics API error when listing pod metrics: {e}")
+        return {}
+
+    pod_metrics = {}
+    for item in metrics_list.get('items', []):
+        # Assuming the main container is the first one
+        if item.get('containers'):
+            usage = item['containers'][0]['usage']
+            pod_metrics[item['metadata']['name']] = {
+                "cpu": usage.get('cpu', 'N/A'),
+                "memory": usage.get('memory', 'N/A'),
+            }
+    return pod_metrics
 
 def get_pod_logs(pod_name: str, tail_lines: int = 200) -> str:
     """
     Retrieves the last N lines of logs from a specified pod.
+    Raises ApiException on K8s API errors.
     """
-    try:
-        return core_v1_api.read_namespaced_pod_log(
-            name=pod_name,
-            namespace=POD_NAMESPACE,
-            tail_lines=tail_lines
-        )
-    except ApiException as e:
-        logger.error(f"K8s API error when fetching logs for pod {pod_name}: {e}")
-        return f"Error fetching logs from Kubernetes: {e.reason}"
+    return _get_core_v1().read_namespaced_pod_log(
+        name=pod_name,
+        namespace=POD_NAMESPACE,
+        tail_lines=tail_lines
+    )
+
+def get_pod_logs_stream(pod_name: str, tail_lines: int):
+    """
+    Opens the last N lines of a pod's logs as an unread urllib3 response.
+    The caller iterates `.stream()` and must call `.release_conn()` when done.
+    Raises ApiException on K8s API errors.
+    """
+    return _get_core_v1().read_namespaced_pod_log(
+        name=pod_name,
+        namespace=POD_NAMESPACE,
+        tail_lines=tail_lines,
+        _preload_content=False
+    )
 
 def get_storage_usage(pod_name: str) -> list[dict]:
     """
@@ -260,44 +546,30 @@ def get_storage_usage(pod_name: str) -> list[dict]:
     The -P flag ensures POSIX-compliant output on a single line per filesystem.
     Returns a list of dictionaries, with sizes in kilobytes.
     """
-    exec_command = ['/bin/sh', '-c', "df -Pk /opengrok/src /opengrok/data"]
+    resp = ""
     try:
-        resp = stream(
-            core_v1_api.connect_get_namespaced_pod_exec,
-            pod_name, POD_NAMESPACE,
-            command=exec_command,
-            stderr=True, stdin=False, stdout=True, tty=False
-        )
+        _, resp = _run_in_pod(pod_name, "df -Pk /opengrok/src /opengrok/data 2>&1")
         
-        lines = resp.strip().split('\n')
-        parsed_data = []
-
-        for line in lines:
-            line = line.strip()
-            # Skip header or empty lines
-            if not line or line.startswith('Filesystem'):
-                continue
-
-            parts = re.split(r'\s+', line)
-            if len(parts) < 6:
-                continue
-            
-            # Check if the second column is a digit, indicating a data line
-            if not parts[1].isdigit():
-                continue
-
-            parsed_data.append({
+        # Skip the header line by position; data lines have at least 6 columns and a numeric size
+        rows = (line.split() for line in resp.splitlines()[1:])
+        return [
+            {
                 "filesystem": parts[0],
                 "size_kb": int(parts[1]),
                 "used_kb": int(parts[2]),
                 "available_kb": int(parts[3]),
                 "use_percent": parts[4],
                 "mountpoint": parts[5],
-            })
-        return parsed_data
+            }
+            for parts in rows
+            if len(parts) >= 6 and parts[1].isdigit()
+        ]
     except ApiException as e:
         logger.error(f"K8s API error when executing command in pod {pod_name}: {e}")
         return []
     except (ValueError, IndexError) as e:
         logger.error(f"Failed to parse 'df -Pk' output: '{resp}'. Error: {e}")
         return []
+    except Exception as e:
+        logger.error(f"Exec failed when reading storage usage of pod {pod_name}: {e}")
+        return []
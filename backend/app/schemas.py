@@ -1,20 +1,66 @@
+import re
 from datetime import datetime
-from typing import Optional
-from enum import Enum
-
-from pydantic import BaseModel, Field, validator
-
-
-class RepositoryStatus(str, Enum):
-    """Enumeration for repository processing statuses."""
-    PENDING = "PENDING"
-    POD_CREATING = "POD_CREATING"
-    CLONING = "CLONING"
-    COMPLETED = "COMPLETED"
-    FAILED = "FAILED"
-    DELETING = "DELETING"
-    DELETION_FAILED = "DELETION_FAILED"
-    UNKNOWN_CLEANUP = "UNKNOWN_CLEANUP"
+from typing import Final, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Characters rejected in a commit ID / ref name (see git-check-ref-format)
+_COMMIT_ID_FORBIDDEN_RE = re.compile(r'[ ~^:?*\[\\\]]')
+
+
+def validate_commit_id(v: str) -> str:
+    """
+    Checks a commit ID / ref name against the git-check-ref-format rules we rely on.
+    Raises ValueError with a message naming the rule that failed.
+    """
+    if not v:
+        raise ValueError('commit_id cannot be empty')
+    # Rules based on git-check-ref-format
+    # 1. It must not contain spaces or invalid characters.
+    if _COMMIT_ID_FORBIDDEN_RE.search(v):
+        raise ValueError('cannot contain spaces or special characters: ~^:?*[]\\')
+    # 2. It must not contain ".."
+    if '..' in v:
+        raise ValueError('cannot contain ".."')
+    # 3. It must not start or end with a "/"
+    if v.startswith('/') or v.endswith('/'):
+        raise ValueError('cannot start or end with "/"')
+    return v
+
+
+# Daily auto-sync time, 'HH:MM' (UTC)
+AUTO_SYNC_SCHEDULE_PATTERN = r"^(2[0-3]|[01]?[0-9]):([0-5]?[0-9])$"
+_AUTO_SYNC_SCHEDULE_RE = re.compile(AUTO_SYNC_SCHEDULE_PATTERN)
+
+
+def validate_auto_sync_schedule(v: Optional[str]) -> str:
+    """
+    Checks the schedule of an auto-sync enabled repository.
+    Raises ValueError if it is missing or not a valid 'HH:MM' time.
+    """
+    if v is None:
+        raise ValueError('required when auto_sync_enabled is true')
+    if not _AUTO_SYNC_SCHEDULE_RE.match(v):
+        raise ValueError("must be a valid 'HH:MM' time (UTC)")
+    return v
+
+
+class RepositoryStatus:
+    """Repository processing statuses, stored and serialized as plain strings."""
+    PENDING: Final = "PENDING"
+    POD_CREATING: Final = "POD_CREATING"
+    CLONING: Final = "CLONING"
+    COMPLETED: Final = "COMPLETED"
+    FAILED: Final = "FAILED"
+    DELETING: Final = "DELETING"
+    DELETION_FAILED: Final = "DELETION_FAILED"
+    UNKNOWN_CLEANUP: Final = "UNKNOWN_CLEANUP"
+
+
+RepositoryStatusValue = Literal[
+    "PENDING", "POD_CREATING", "CLONING", "COMPLETED",
+    "FAILED", "DELETING", "DELETION_FAILED", "UNKNOWN_CLEANUP",
+]
 
 
 class RepositoryRequest(BaseModel):
@@ -36,33 +82,22 @@ class RepositoryRequest(BaseModel):
     auto_sync_enabled: bool = False
     auto_sync_schedule: Optional[str] = Field(
         default=None,
-        pattern=r"^(2[0-3]|[01]?[0-9]):([0-5]?[0-9])$",
+        pattern=AUTO_SYNC_SCHEDULE_PATTERN,
         description="Daily sync time in 'HH:MM' format (UTC). Required if auto_sync_enabled is true.",
     )
 
-    @validator('auto_sync_schedule', always=True)
-    def schedule_required_if_enabled(cls, v, values):
-        if values.get('auto_sync_enabled') and v is None:
+    @model_validator(mode='after')
+    def schedule_required_if_enabled(self):
+        if self.auto_sync_enabled and self.auto_sync_schedule is None:
             raise ValueError('auto_sync_schedule is required when auto_sync_enabled is true')
-        if not values.get('auto_sync_enabled'):
-            return None # If disabled, always set schedule to None, ignoring any passed value.
-        return v
-
-    @validator('commit_id')
-    def validate_commit_id(cls, v):
-        if not v:
-            raise ValueError('commit_id cannot be empty')
-        # Rules based on git-check-ref-format
-        # 1. It must not contain spaces or invalid characters.
-        if any(char in v for char in ' ~^:?*[\\]'):
-            raise ValueError('cannot contain spaces or special characters: ~^:?*[]\\')
-        # 2. It must not contain ".."
-        if '..' in v:
-            raise ValueError('cannot contain ".."')
-        # 3. It must not start or end with a "/"
-        if v.startswith('/') or v.endswith('/'):
-            raise ValueError('cannot start or end with "/"')
-        return v
+        if not self.auto_sync_enabled:
+            self.auto_sync_schedule = None # If disabled, always set schedule to None, ignoring any passed value.
+        return self
+
+    @field_validator('commit_id')
+    @classmethod
+    def check_commit_id(cls, v):
+        return validate_commit_id(v)
 
 
 class RepositoryExpirationUpdateRequest(BaseModel):
@@ -77,7 +112,7 @@ class RepositoryAutoSyncUpdateRequest(BaseModel):
     auto_sync_enabled: bool
     auto_sync_schedule: Optional[str] = Field(
         default=None,
-        pattern=r"^(2[0-3]|[01]?[0-9]):([0-5]?[0-9])$",
+        pattern=AUTO_SYNC_SCHEDULE_PATTERN,
         description="Daily sync time in 'HH:MM' format (UTC). Required if auto_sync_enabled is true.",
     )
 
@@ -94,7 +129,7 @@ class RepositoryInfo(BaseModel):
     id: int
     repo_url: str
     commit_id: str
-    status: RepositoryStatus
+    status: RepositoryStatusValue
     job_name: str
     pvc_path: str
     created_at: datetime
@@ -107,8 +142,7 @@ class RepositoryInfo(BaseModel):
     auto_sync_schedule: Optional[str] = None
     task_log: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class StorageUsageInfo(BaseModel):
@@ -149,13 +183,13 @@ class OpenGrokStatusResponse(BaseModel):
 class RepositoryExport(BaseModel):
     """Schema for a single repository in the export format."""
     repo_url: str
-    commit_id: str
+    commit_id: str  # Checked per repository on import, so one bad entry doesn't reject the whole file
     pvc_path: str
     clone_single_branch: bool
     clone_recursive: bool
     retention_days: Optional[int] = None  # Calculated from expired_at, or None for indefinite
     auto_sync_enabled: bool
-    auto_sync_schedule: Optional[str] = None
+    auto_sync_schedule: Optional[str] = None  # Checked per repository on import, like commit_id
 
 
 class RepositoriesExportResponse(BaseModel):
@@ -1,23 +1,11 @@
 import asyncio
 import logging
 import httpx
-import aiosqlite
-import sqlite3
-from datetime import datetime, timezone, timedelta
-
-from kubernetes.client.rest import ApiException
-
-from .config import (
-    DB_PATH,
-    OPEN_GROK_REINDEX_URL,
-    AUTO_SYNC_INTERVAL_SEC,
-    POD_NAMESPACE,
-    WATCH_INTERVAL_SEC,
-)
-from . import k8s
-from .database import custom_connection_factory
+from datetime import datetime, timezone
+
+from .config import OPEN_GROK_REINDEX_URL, REINDEX_DEBOUNCE_SEC
 from . import k8s
-from .database import custom_connection_factory
+from .database import pool
 
 logger = logging.getLogger(f"uvicorn.{__name__}")
 STOP_WATCHER = asyncio.Event()
@@ -27,20 +15,24 @@ STOP_WATCHER = asyncio.Event()
 K8S_EXEC_LOCK = asyncio.Lock()
 
 
+# Shared client so reindex triggers reuse a keep-alive connection. Closed on app shutdown.
+# The timeout makes sure a failed request does not block the worker.
+_reindex_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+)
+
+
 async def trigger_opengrok_reindex(job_name: str):
     """
     Sends a GET request to the OpenGrok reindex endpoint.
     """
     logger.info(f"Triggering OpenGrok reindex for Job: {job_name}. URL: {OPEN_GROK_REINDEX_URL}")
     
-    # Set a timeout so that a failed request does not block the worker.
-    timeout = httpx.Timeout(10.0, connect=5.0)
-    
     try:
         # Send an asynchronous GET request using httpx
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(OPEN_GROK_REINDEX_URL)
-            response.raise_for_status() # Detect HTTP error codes
+        response = await _reindex_client.get(OPEN_GROK_REINDEX_URL)
+        response.raise_for_status() # Detect HTTP error codes
 
         logger.info(f"OpenGrok reindex successfully triggered. Response status: {response.status_code}")
 
@@ -51,6 +43,47 @@ async def trigger_opengrok_reindex(job_name: str):
     except Exception as e:
         logger.error(f"An unexpected error occurred while triggering reindex: {e}")
 
+# Reindex requests waiting for reindex_dispatcher. A full reindex covers every repository,
+# so requests arriving close together are sent as one trigger.
+_reindex_pending = asyncio.Event()
+_reindex_reasons: list[str] = []
+
+
+def request_opengrok_reindex(reason: str):
+    """
+    Queues an OpenGrok reindex without waiting for it.
+    Requests made within REINDEX_DEBOUNCE_SEC of each other are coalesced into one trigger.
+    """
+    _reindex_reasons.append(reason)
+    _reindex_pending.set()
+
+
+async def reindex_dispatcher():
+    """
+    Long-running task that sends the reindex requests queued by request_opengrok_reindex.
+    Exits when STOP_WATCHER is set, sending a reindex that is still pending first.
+    """
+    stop = asyncio.create_task(STOP_WATCHER.wait())
+    try:
+        while not stop.done():
+            pending = asyncio.create_task(_reindex_pending.wait())
+            await asyncio.wait({pending, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if not pending.done():
+                pending.cancel()
+                break
+            # Let requests arriving shortly after the first one join the same reindex
+            await asyncio.wait({stop}, timeout=REINDEX_DEBOUNCE_SEC)
+            _reindex_pending.clear()
+            reasons = ", ".join(_reindex_reasons)
+            _reindex_reasons.clear()
+            await trigger_opengrok_reindex(reasons)
+    finally:
+        stop.cancel()
+
+async def close_reindex_client():
+    """Closes the shared reindex HTTP client. Called on application shutdown."""
+    await _reindex_client.aclose()
+
 async def perform_clone_task(record_id: int, repo_url: str, pvc_path: str, commit_id: str, single_branch: bool, recursive: bool):
     """
     Background task to execute git clone/pull in OpenGrok pod and update DB status.
@@ -59,7 +92,7 @@ async def perform_clone_task(record_id: int, repo_url: str, pvc_path: str, commi
     
     # 1. Update status to CLONING
     try:
-        async with aiosqlite.connect(DB_PATH, factory=custom_connection_factory) as db:
+        async with pool.write() as db:
             await db.execute(
                 "UPDATE repositories SET status = 'CLONING', updated_at = ? WHERE id = ?",
                 (datetime.now(timezone.utc), record_id)
@@ -80,7 +113,7 @@ async def perform_clone_task(record_id: int, repo_url: str, pvc_path: str, commi
     current_timestamp = datetime.now(timezone.utc)
     
     try:
-        async with aiosqlite.connect(DB_PATH, factory=custom_connection_factory) as db:
+        async with pool.write() as db:
             await db.execute(
                 "UPDATE repositories SET status = ?, updated_at = ?, task_log = ? WHERE id = ?",
                 (new_status, current_timestamp, output, record_id)
@@ -92,144 +125,114 @@ async def perform_clone_task(record_id: int, repo_url: str, pvc_path: str, commi
 
     if success:
         logger.info(f"Clone success for {record_id}.")
-        await trigger_opengrok_reindex(f"repo-{record_id}")
+        request_opengrok_reindex(f"repo-{record_id}")
     else:
         logger.error(f"Clone failed for {record_id}. Output: {output}")
 
-async def perform_cleanup_task(record_id: int):
+async def run_scheduled_sync(record_id: int):
     """
-    Background task to execute cleanup and update status/delete record.
+    Scheduled job (one per auto-sync enabled repository) that triggers a sync.
+    Skips the repository if auto-sync was disabled, a sync is still pending,
+    or it was already synced today.
     """
-    db = None
+    now = datetime.now(timezone.utc)
     try:
-        db = await aiosqlite.connect(DB_PATH, factory=custom_connection_factory)
-        
-        async with db.execute("SELECT pvc_path FROM repositories WHERE id = ?", (record_id,)) as cursor:
-            record = await cursor.fetchone()
-        
-        if not record:
-            return
+        async with pool.write() as db:
+            # Check and mark the repository as PENDING in one statement,
+            # so that overlapping triggers cannot start the same sync twice.
+            async with db.execute(
+                """
+                UPDATE repositories SET status = 'PENDING', job_name = 'SYNC', last_synced_at = ?
+                WHERE id = ? AND auto_sync_enabled AND status != 'PENDING'
+                    AND (last_synced_at IS NULL OR date(last_synced_at) != date(?))
+                RETURNING repo_url, pvc_path, commit_id, clone_single_branch, clone_recursive
+                """,
+                (now, record_id, now)
+            ) as cursor:
+                repo = await cursor.fetchone()
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Failed to trigger auto-sync for repo ID {record_id}: {e}")
+        return
 
-        pvc_path = record['pvc_path']
-        
+    if not repo:
+        logger.info(f"Skipping auto-sync for repo ID {record_id} (disabled, pending, or already synced today).")
+        return
+
+    logger.info(f"Triggering auto-sync for repository ID: {record_id} ({repo['repo_url']})")
+    await perform_clone_task(
+        record_id,
+        repo['repo_url'],
+        repo['pvc_path'],
+        repo['commit_id'],
+        repo['clone_single_branch'],
+        repo['clone_recursive']
+    )
+
+async def perform_cleanup_task(record_id: int, pvc_path: str):
+    """
+    Background task to execute cleanup and update status/delete record.
+    """
+    try:
         logger.info(f"Starting cleanup for repo ID {record_id} ({pvc_path})")
         
         async with K8S_EXEC_LOCK:
             success = await asyncio.to_thread(k8s.exec_cleanup_repository, pvc_path)
-        
+
+        async with pool.write() as db:
+            if success:
+                await db.execute("DELETE FROM repositories WHERE id = ?", (record_id,))
+            else:
+                await db.execute(
+                    "UPDATE repositories SET status = 'DELETION_FAILED', updated_at = ?, task_log = ? WHERE id = ?",
+                    (datetime.now(timezone.utc), "Cleanup failed via exec.", record_id)
+                )
+            await db.commit()
+
         if success:
-            await db.execute("DELETE FROM repositories WHERE id = ?", (record_id,))
             logger.info(f"Cleanup SUCCEEDED for repo ID {record_id}.")
-            await trigger_opengrok_reindex(f"cleanup-repo-{record_id}")
+            request_opengrok_reindex(f"cleanup-repo-{record_id}")
         else:
             logger.error(f"Cleanup FAILED for repo ID {record_id}.")
-            await db.execute(
-                "UPDATE repositories SET status = 'DELETION_FAILED', updated_at = ?, task_log = ? WHERE id = ?",
-                (datetime.now(timezone.utc), "Cleanup failed via exec.", record_id)
-            )
-        await db.commit()
 
     except Exception as e:
         logger.error(f"Error in cleanup task for {record_id}: {e}")
-    finally:
-        if db:
-            await db.close()
 
 
 
-async def auto_sync_worker():
+async def perform_bulk_cleanup_task(records: list[tuple[int, str]]):
     """
-    Background task to check for and trigger scheduled repository syncs.
+    Background task to clean up several repositories at once.
+    Removes the directories one by one, then deletes/updates the records in one
+    transaction and requests a single reindex.
     """
-    logger.info("Starting Auto-Sync Worker.")
-
-    # Keep track of the last time the check was run
-    last_check_time = datetime.now(timezone.utc)
-
-    while not STOP_WATCHER.is_set():
-        await asyncio.sleep(AUTO_SYNC_INTERVAL_SEC)
+    if not records:
+        return
+    try:
+        logger.info(f"Starting bulk cleanup for {len(records)} repositories")
+
+        failed = set()
+        for _, pvc_path in records:
+            # Locked per path so that clones, syncs and log reads can run between removals
+            async with K8S_EXEC_LOCK:
+                if not await asyncio.to_thread(k8s.exec_cleanup_repository, pvc_path):
+                    failed.add(pvc_path)
+
+        succeeded_ids = [(record_id,) for record_id, pvc_path in records if pvc_path not in failed]
+        failed_ids = [record_id for record_id, pvc_path in records if pvc_path in failed]
+        now = datetime.now(timezone.utc)
+
+        async with pool.write() as db:
+            await db.executemany("DELETE FROM repositories WHERE id = ?", succeeded_ids)
+            await db.executemany(
+                "UPDATE repositories SET status = 'DELETION_FAILED', updated_at = ?, task_log = ? WHERE id = ?",
+                [(now, "Cleanup failed via exec.", record_id) for record_id in failed_ids]
+            )
+            await db.commit()
 
-        db = None
-        try:
-            db = await aiosqlite.connect(DB_PATH, factory=custom_connection_factory)
-            
-            current_check_time = datetime.now(timezone.utc)
+        logger.info(f"Bulk cleanup finished: {len(succeeded_ids)} succeeded, {len(failed_ids)} failed.")
+        if succeeded_ids:
+            request_opengrok_reindex(f"cleanup-{len(succeeded_ids)}-repos")
 
-            # Find repositories that are enabled for auto-sync
-            async with db.execute(
-                "SELECT * FROM repositories WHERE auto_sync_enabled = TRUE AND auto_sync_schedule IS NOT NULL"
-            ) as cursor:
-                repos_to_sync = await cursor.fetchall()
-
-            if not repos_to_sync:
-                # Update last_check_time even if there are no repos to sync
-                last_check_time = current_check_time
-                continue
-
-            for repo in repos_to_sync:
-                # Check if the scheduled time falls between the last check and the current check
-                schedule_time_str = repo['auto_sync_schedule'] # "HH:MM"
-                schedule_hour, schedule_minute = map(int, schedule_time_str.split(':'))
-                
-                # Find the most recent past occurrence of the scheduled time
-                potential_sync_time = current_check_time.replace(hour=schedule_hour, minute=schedule_minute, second=0, microsecond=0)
-                if potential_sync_time > current_check_time:
-                    # If the time is in the future for today, check yesterday's time
-                    potential_sync_time -= timedelta(days=1)
-
-                # If the scheduled time was between the last check and now, it's due for a sync.
-                if not (last_check_time < potential_sync_time <= current_check_time):
-                    continue
-
-                # Check if the last sync was on a different day to prevent multiple syncs in one day
-                last_synced_at = repo['last_synced_at']
-                last_synced_date_str = ""
-                if last_synced_at:
-                    # The value might be a string or a datetime object depending on where it was written.
-                    # Handle both cases to be safe.
-                    if isinstance(last_synced_at, str):
-                        last_synced_at = datetime.fromisoformat(last_synced_at)
-                    last_synced_date_str = last_synced_at.strftime("%Y-%m-%d")
-
-                if last_synced_date_str == potential_sync_time.strftime("%Y-%m-%d"):
-                    logger.info(f"Repo ID {repo['id']} already synced today. Skipping.")
-                    continue
-
-                # Do not trigger a new sync if the previous one is still pending
-                if repo['status'] == 'PENDING':
-                    logger.warning(f"Skipping auto-sync for repo ID {repo['id']} as its status is PENDING.")
-                    continue
-
-                logger.info(f"Triggering auto-sync for repository ID: {repo['id']} ({repo['repo_url']})")
-
-                try:
-                    # 1. Update the database record to PENDING first
-                    await db.execute(
-                        "UPDATE repositories SET status = 'PENDING', job_name = 'SYNC', last_synced_at = ? WHERE id = ?",
-                        (current_check_time, repo['id'])
-                    )
-                    await db.commit()
-
-                    # 2. Then trigger the clone task
-                    asyncio.create_task(perform_clone_task(
-                        repo['id'],
-                        repo['repo_url'],
-                        repo['pvc_path'],
-                        repo['commit_id'],
-                        repo['clone_single_branch'],
-                        repo['clone_recursive']
-                    ))
-
-                except Exception as e:
-                    logger.error(f"Failed to trigger auto-sync for repo ID {repo['id']}: {e}")
-
-            # Update the last check time after processing all repos
-            last_check_time = current_check_time
-
-        except Exception as e:
-            logger.error(f"Error during database operation in auto-sync worker: {e}")
-        finally:
-            if db:
-                await db.close()
-
-    logger.info("Auto-Sync Worker stopped.")
+    except Exception as e:
+        logger.error(f"Error in bulk cleanup task: {e}")
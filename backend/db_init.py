@@ -7,6 +7,8 @@ import logging
 logger = logging.getLogger(f"uvicorn.{__name__}")
 
 DB_PATH = "/data/manager.db"
+# Bump when adding a column migration below
+SCHEMA_VERSION = 1
 
 def initialize_db_sync():
     """
@@ -23,6 +25,10 @@ def initialize_db_sync():
             # Match the settings with custom_connection_factory in main.py
             conn.row_factory = sqlite3.Row 
             cursor = conn.cursor()
+            # WAL is persisted in the DB file, so the app's connections start in WAL mode
+            # and the init writes below already avoid rollback-journal fsyncs.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
             # Create table if it doesn't exist
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS repositories (
@@ -44,18 +50,44 @@ def initialize_db_sync():
                 )
             """)
 
-            # Add new columns to existing table for migration
-            cursor.execute("PRAGMA table_info(repositories)")
-            columns = [row[1] for row in cursor.fetchall()]
-            if 'auto_sync_enabled' not in columns:
-                cursor.execute("ALTER TABLE repositories ADD COLUMN auto_sync_enabled BOOLEAN NOT NULL DEFAULT FALSE")
-                logger.info("Column 'auto_sync_enabled' added to repositories table.")
-            if 'auto_sync_schedule' not in columns:
-                cursor.execute("ALTER TABLE repositories ADD COLUMN auto_sync_schedule TEXT")
-                logger.info("Column 'auto_sync_schedule' added to repositories table.")
-            if 'task_log' not in columns:
-                cursor.execute("ALTER TABLE repositories ADD COLUMN task_log TEXT")
-                logger.info("Column 'task_log' added to repositories table.")
+            # Add new columns to existing table for migration.
+            # user_version records that this was done, so later starts skip the table_info scan.
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < SCHEMA_VERSION:
+                # DDL is not wrapped in a transaction implicitly, so begin one explicitly
+                # to apply the ALTERs and the version bump atomically.
+                cursor.execute("BEGIN")
+                cursor.execute("PRAGMA table_info(repositories)")
+                columns = [row[1] for row in cursor.fetchall()]
+                if 'auto_sync_enabled' not in columns:
+                    cursor.execute("ALTER TABLE repositories ADD COLUMN auto_sync_enabled BOOLEAN NOT NULL DEFAULT FALSE")
+                    logger.info("Column 'auto_sync_enabled' added to repositories table.")
+                if 'auto_sync_schedule' not in columns:
+                    cursor.execute("ALTER TABLE repositories ADD COLUMN auto_sync_schedule TEXT")
+                    logger.info("Column 'auto_sync_schedule' added to repositories table.")
+                if 'task_log' not in columns:
+                    cursor.execute("ALTER TABLE repositories ADD COLUMN task_log TEXT")
+                    logger.info("Column 'task_log' added to repositories table.")
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+
+            # Indexes for lookups outside the UNIQUE constraints above
+            # (pvc_path and (repo_url, commit_id) are already backed by automatic indexes).
+            # Partial index: only rows with an expiration are scanned by the cleanup job.
+            # It also covers status, so rows already being deleted are skipped without a table lookup.
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_repo_expired_cover ON repositories(expired_at, status) "
+                "WHERE expired_at IS NOT NULL"
+            )
+            # Partial index for loading auto-sync jobs at startup
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_repo_auto_sync ON repositories(auto_sync_schedule) "
+                "WHERE auto_sync_enabled"
+            )
+            # Lets list_repositories read rows in ORDER BY created_at DESC without a sort step
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_repo_created_at ON repositories(created_at DESC)"
+            )
 
             conn.commit()
         logger.info("Database and table initialization/migration complete (Sync).")
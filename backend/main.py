@@ -2,8 +2,8 @@ import asyncio
 import logging
 
 from fastapi import FastAPI
-from app import config, worker
-from app.api import router as api_router
+from app import config, database, worker
+from app.api import router as api_router, scheduler, start_scheduler
 
 # --- Logging Setup ---
 logger = logging.getLogger(f"uvicorn.{__name__}")
@@ -26,17 +26,21 @@ async def startup_event():
         # In a real scenario, the process should terminate here
     
     logger.info("Database initialization skipped (handled by pre-start script).")
-    
-    # Start the background worker
+    await database.pool.open()
+
+    # Auto-sync runs as one scheduler job per repository (replaces the polling worker)
     # watcher_task = asyncio.create_task(worker.job_watcher_worker()) # Deprecated
-    auto_sync_task = asyncio.create_task(worker.auto_sync_worker())
-    app.state.worker_tasks = [auto_sync_task]
+    await start_scheduler()
+    app.state.worker_tasks = [
+        asyncio.create_task(worker.reindex_dispatcher(), name="reindex_dispatcher"),
+    ]
     
     logger.info("FastAPI startup complete, background workers initiated.")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop the worker on application shutdown."""
+    scheduler.shutdown(wait=False)
     worker.STOP_WATCHER.set()
     tasks = app.state.worker_tasks
     if tasks:
@@ -49,6 +53,9 @@ async def shutdown_event():
         
         # Gather results to propagate any exceptions during shutdown
         await asyncio.gather(*done, return_exceptions=True)
+
+    await database.pool.close()
+    await worker.close_reindex_client()
     
     logger.info("FastAPI shutdown complete, background workers stopped.")
 
@@ -4,10 +4,7 @@ import asyncio
 import aiosqlite
 from httpx import AsyncClient, ASGITransport
 from main import app
-from app.database import get_db_session
-
-# Use an in-memory database for testing
-TEST_DB_PATH = ":memory:"
+from app import database
 
 async def init_test_db(db: aiosqlite.Connection):
     await db.execute("""
@@ -39,18 +36,20 @@ def event_loop():
     loop.close()
 
 @pytest.fixture(scope="function")
-async def db_session():
-    async with aiosqlite.connect(TEST_DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
+async def db_pool(tmp_path, monkeypatch):
+    """The application's DB pool, opened on a fresh database file."""
+    db_path = str(tmp_path / "manager.db")
+    async with aiosqlite.connect(db_path) as db:
         await init_test_db(db)
-        yield db
 
-@pytest.fixture(scope="function")
-async def client(db_session):
-    async def override_get_db_session():
-        yield db_session
+    monkeypatch.setattr(database.pool, "db_path", db_path)
+    # The lock binds to the event loop it first waits on, and every test runs in its own loop
+    monkeypatch.setattr(database.pool, "write_lock", asyncio.Lock())
+    await database.pool.open()
+    yield database.pool
+    await database.pool.close()
 
-    app.dependency_overrides[get_db_session] = override_get_db_session
+@pytest.fixture(scope="function")
+async def client(db_pool):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
-    app.dependency_overrides.clear()
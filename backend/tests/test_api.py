@@ -1,5 +1,10 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
+from kubernetes.client.rest import ApiException
+
+from app import api, k8s, worker
 
 @pytest.mark.asyncio
 async def test_get_app_config(client: AsyncClient):
@@ -22,3 +27,335 @@ async def test_create_repository_invalid_url(client: AsyncClient):
     }
     response = await client.post("/api/v1/repository", json=payload)
     assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_create_repository_runs_clone_task(client: AsyncClient, monkeypatch):
+    # The clone task runs after the response and takes the DB write lock itself,
+    # so the request must not still be holding it.
+    monkeypatch.setattr(k8s, "exec_clone_repository", lambda *args: (True, "cloned"))
+    payload = {
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main"
+    }
+    response = await asyncio.wait_for(client.post("/api/v1/repository", json=payload), timeout=5)
+    assert response.status_code == 202
+
+    response = await client.get("/api/v1/repositories")
+    [repo] = response.json()
+    assert repo["status"] == "COMPLETED"
+
+@pytest.mark.asyncio
+async def test_delete_repository_runs_cleanup_task(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(k8s, "exec_clone_repository", lambda *args: (True, "cloned"))
+    monkeypatch.setattr(k8s, "exec_cleanup_repository", lambda pvc_path: True)
+    payload = {
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main"
+    }
+    record_id = (await client.post("/api/v1/repository", json=payload)).json()["id"]
+
+    response = await asyncio.wait_for(client.delete(f"/api/v1/repository/{record_id}"), timeout=5)
+    assert response.status_code == 202
+
+    response = await client.get("/api/v1/repositories")
+    assert response.json() == []
+
+@pytest.mark.asyncio
+async def test_live_log_wait_does_not_hold_read_connections(client: AsyncClient, db_pool, monkeypatch):
+    # A running clone holds the exec lock, so live log reads wait for it
+    exec_lock = asyncio.Lock()
+    monkeypatch.setattr(api, "K8S_EXEC_LOCK", exec_lock)
+    monkeypatch.setattr(k8s, "exec_read_file", lambda path: "live log")
+    async with db_pool.write() as db:
+        await db.execute(
+            "INSERT INTO repositories (repo_url, commit_id, status, job_name, pvc_path) "
+            "VALUES ('https://example.com/org/repo.git', 'main', 'CLONING', 'EXEC', 'repo-main')"
+        )
+        await db.commit()
+
+    async with exec_lock:
+        log_requests = [
+            asyncio.ensure_future(client.get("/api/v1/repository/1/logs"))
+            for _ in range(db_pool.size + 1)
+        ]
+        await asyncio.sleep(0.1)
+        response = await asyncio.wait_for(client.get("/api/v1/repositories"), timeout=5)
+        assert response.status_code == 200
+
+    for response in await asyncio.gather(*log_requests):
+        assert response.json() == {"logs": "live log"}
+
+@pytest.mark.asyncio
+async def test_create_repository_invalid_commit_id(client: AsyncClient):
+    payload = {
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "feature..branch"
+    }
+    response = await client.post("/api/v1/repository", json=payload)
+    assert response.status_code == 422
+    assert 'cannot contain ".."' in response.json()["detail"][0]["msg"]
+
+@pytest.mark.asyncio
+async def test_import_reports_invalid_commit_id_per_repository(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(k8s, "exec_clone_repository", lambda *args: (True, "cloned"))
+    repository = {
+        "repo_url": "https://example.com/org/repo.git",
+        "clone_single_branch": False,
+        "clone_recursive": False,
+        "auto_sync_enabled": False,
+    }
+    payload = {"repositories": [
+        {**repository, "commit_id": "main", "pvc_path": "repo-main"},
+        {**repository, "commit_id": "bad name", "pvc_path": "repo-bad"},
+    ]}
+    response = await client.post("/api/v1/repositories/import", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["skipped"], data["errors"]) == (1, 0, 1)
+    assert data["results"][1]["status"] == "error"
+    assert "special characters" in data["results"][1]["message"]
+
+@pytest.mark.asyncio
+async def test_list_repositories_matches_response_model(client: AsyncClient, monkeypatch):
+    # Leave the repository untouched by the clone task so both responses describe the same row
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    payload = {
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "retention_days": 7
+    }
+    created = (await client.post("/api/v1/repository", json=payload)).json()
+
+    response = await client.get("/api/v1/repositories")
+    assert response.status_code == 200
+    assert response.json() == [created]
+    assert created["expired_at"].endswith("Z")
+    assert created["task_log"] is None
+
+@pytest.mark.asyncio
+async def test_create_repository_conflicts(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    payload = {
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "project_name": "repo"
+    }
+    assert (await client.post("/api/v1/repository", json=payload)).status_code == 202
+
+    # Same project name for a different repository
+    response = await client.post("/api/v1/repository", json={**payload, "repo_url": "https://example.com/org/other.git"})
+    assert response.status_code == 409
+    assert "Project name 'repo' is already in use" in response.json()["detail"]
+
+    # Same repository and commit under a different project name
+    response = await client.post("/api/v1/repository", json={**payload, "project_name": "repo-copy"})
+    assert response.status_code == 409
+    assert "already exists under the project name 'repo'" in response.json()["detail"]
+
+    response = await client.get("/api/v1/repositories")
+    assert len(response.json()) == 1
+
+@pytest.mark.asyncio
+async def test_import_repositories_counts(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    await client.post("/api/v1/repository", json={
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "project_name": "existing"
+    })
+    repository = {
+        "clone_single_branch": False,
+        "clone_recursive": False,
+        "auto_sync_enabled": False,
+    }
+    payload = {"repositories": [
+        # Created
+        {**repository, "repo_url": "https://example.com/org/a.git", "commit_id": "main", "pvc_path": "a"},
+        # Skipped: pvc_path already in the DB
+        {**repository, "repo_url": "https://example.com/org/b.git", "commit_id": "main", "pvc_path": "existing"},
+        # Skipped: pvc_path repeated within the request
+        {**repository, "repo_url": "https://example.com/org/c.git", "commit_id": "main", "pvc_path": "a"},
+        # Error: repository and commit already exist under another pvc_path
+        {**repository, "repo_url": "https://example.com/org/repo.git", "commit_id": "main", "pvc_path": "d"},
+    ]}
+    response = await client.post("/api/v1/repositories/import", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total"], data["created"], data["skipped"], data["errors"]) == (4, 1, 2, 1)
+    assert [result["status"] for result in data["results"]] == ["created", "skipped", "skipped", "error"]
+
+    response = await client.get("/api/v1/repositories")
+    assert sorted(repo["pvc_path"] for repo in response.json()) == ["a", "existing"]
+
+@pytest.mark.asyncio
+async def test_import_repositories_looks_up_paths_in_chunks(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    monkeypatch.setattr(api, "_IMPORT_LOOKUP_CHUNK", 2)
+    await client.post("/api/v1/repository", json={
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "project_name": "existing"
+    })
+    repository = {
+        "commit_id": "main",
+        "clone_single_branch": False,
+        "clone_recursive": False,
+        "auto_sync_enabled": False,
+    }
+    paths = ["r0", "r1", "existing", "r3", "r4"]
+    payload = {"repositories": [
+        {**repository, "repo_url": f"https://example.com/org/{path}.git", "pvc_path": path}
+        for path in paths
+    ]}
+    response = await client.post("/api/v1/repositories/import", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["skipped"], data["errors"]) == (4, 1, 0)
+    assert [result["status"] for result in data["results"]] == ["created", "created", "skipped", "created", "created"]
+
+@pytest.mark.asyncio
+async def test_export_repositories(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    await client.post("/api/v1/repository", json={
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "project_name": "repo",
+        "retention_days": 7,
+        "auto_sync_enabled": True,
+        "auto_sync_schedule": "03:30"
+    })
+
+    response = await client.get("/api/v1/repositories/export")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["version"] == "1.0"
+    assert data["exported_at"].endswith("Z")
+    assert data["repositories"] == [{
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "pvc_path": "repo",
+        "clone_single_branch": False,
+        "clone_recursive": False,
+        "retention_days": 6,  # whole days left, counted just after creation
+        "auto_sync_enabled": True,
+        "auto_sync_schedule": "03:30",
+    }]
+
+@pytest.mark.asyncio
+async def test_auto_sync_job_follows_repository(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    monkeypatch.setattr(worker, "perform_cleanup_task", lambda *args: None)
+    # Paused so that jobs are registered (and replaced) as in production but never run
+    api.scheduler.start(paused=True)
+    response = await client.post("/api/v1/repository", json={
+        "repo_url": "https://example.com/org/repo.git",
+        "commit_id": "main",
+        "auto_sync_enabled": True,
+        "auto_sync_schedule": "03:30"
+    })
+    record_id = response.json()["id"]
+    job_id = f"repo-{record_id}"
+    try:
+        job = api.scheduler.get_job(job_id)
+        assert job.args == (record_id,)
+        assert str(job.trigger.fields[5]) == "3"  # hour
+        assert str(job.trigger.fields[6]) == "30"  # minute
+
+        await client.put(f"/api/v1/repository/{record_id}/autosync", json={
+            "auto_sync_enabled": True, "auto_sync_schedule": "23:05"
+        })
+        assert str(api.scheduler.get_job(job_id).trigger.fields[5]) == "23"
+
+        await client.put(f"/api/v1/repository/{record_id}/autosync", json={"auto_sync_enabled": False})
+        assert api.scheduler.get_job(job_id) is None
+
+        await client.put(f"/api/v1/repository/{record_id}/autosync", json={
+            "auto_sync_enabled": True, "auto_sync_schedule": "03:30"
+        })
+        await client.delete(f"/api/v1/repository/{record_id}")
+        assert api.scheduler.get_job(job_id) is None
+    finally:
+        api.scheduler.remove_all_jobs()
+        api.scheduler.shutdown(wait=False)
+
+@pytest.mark.asyncio
+async def test_async_ttl_cache():
+    calls = []
+
+    @api.async_ttl_cache(ttl=60)
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        if key == "bad":
+            raise RuntimeError("failed")
+        return key.upper()
+
+    # Concurrent callers share one call, later callers get the cached result
+    assert await asyncio.gather(fetch("a"), fetch("a")) == ["A", "A"]
+    assert await fetch("a") == "A"
+    assert calls == ["a"]
+
+    # Failures are not cached
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await fetch("bad")
+    assert calls == ["a", "bad", "bad"]
+
+@pytest.mark.asyncio
+async def test_opengrok_log_errors_are_not_cached(client: AsyncClient, monkeypatch):
+    responses = [ApiException(status=503, reason="Service Unavailable"), "log line"]
+    def get_pod_logs(pod_name, tail_lines):
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    monkeypatch.setattr(k8s, "get_pod_logs", get_pod_logs)
+
+    response = await client.get("/api/v1/opengrok/logs", params={"pod_name": "opengrok-uncached"})
+    assert response.json() == {"logs": "Error fetching logs from Kubernetes: Service Unavailable"}
+    response = await client.get("/api/v1/opengrok/logs", params={"pod_name": "opengrok-uncached"})
+    assert response.json() == {"logs": "log line"}
+
+@pytest.mark.asyncio
+async def test_import_reports_invalid_auto_sync_schedule_per_repository(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(worker, "perform_clone_task", lambda **kwargs: None)
+    repository = {
+        "repo_url": "https://example.com/org/repo.git",
+        "clone_single_branch": False,
+        "clone_recursive": False,
+        "auto_sync_enabled": True,
+    }
+    payload = {"repositories": [
+        {**repository, "commit_id": "main", "pvc_path": "repo-main", "auto_sync_schedule": "03:30"},
+        {**repository, "commit_id": "dev", "pvc_path": "repo-dev", "auto_sync_schedule": "25:00"},
+        {**repository, "commit_id": "test", "pvc_path": "repo-test", "auto_sync_schedule": None},
+    ]}
+    try:
+        response = await client.post("/api/v1/repositories/import", json=payload)
+    finally:
+        api.scheduler.remove_all_jobs()
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["skipped"], data["errors"]) == (1, 0, 2)
+    assert [result["status"] for result in data["results"]] == ["created", "error", "error"]
+    assert data["results"][1]["message"].startswith("Invalid auto_sync_schedule")
+
+    response = await client.get("/api/v1/repositories")
+    assert [repo["pvc_path"] for repo in response.json()] == ["repo-main"]
+
+@pytest.mark.asyncio
+async def test_start_scheduler_skips_invalid_schedules(db_pool):
+    async with db_pool.write() as db:
+        await db.executemany(
+            "INSERT INTO repositories (id, repo_url, commit_id, job_name, pvc_path, auto_sync_enabled, auto_sync_schedule) "
+            "VALUES (?, 'https://example.com/org/repo.git', ?, 'EXEC', ?, TRUE, ?)",
+            [(1, "main", "repo-main", "03:30"), (2, "dev", "repo-dev", "25:00"), (3, "test", "repo-test", "bad")]
+        )
+        await db.commit()
+
+    await api.start_scheduler()
+    try:
+        assert sorted(job.id for job in api.scheduler.get_jobs()) == ["cleanup-expired", "repo-1"]
+    finally:
+        api.scheduler.remove_all_jobs()
+        api.scheduler.shutdown(wait=False)
@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from app.database import AioSqlitePool
+
+INSERT_REPO = (
+    "INSERT INTO repositories (repo_url, commit_id, job_name, pvc_path) "
+    "VALUES ('https://example.com/org/repo.git', ?, 'EXEC', ?)"
+)
+
+@pytest.mark.asyncio
+async def test_readers_see_committed_writes(db_pool: AioSqlitePool):
+    async with db_pool.write() as db:
+        await db.execute(INSERT_REPO, ("main", "repo-main"))
+        await db.commit()
+
+    async with db_pool.reader() as db:
+        async with db.execute("SELECT pvc_path FROM repositories") as cursor:
+            assert [row['pvc_path'] for row in await cursor.fetchall()] == ["repo-main"]
+
+@pytest.mark.asyncio
+async def test_readers_are_read_only(db_pool: AioSqlitePool):
+    async with db_pool.reader() as db:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            await db.execute(INSERT_REPO, ("main", "repo-main"))
+
+@pytest.mark.asyncio
+async def test_failed_write_is_rolled_back(db_pool: AioSqlitePool):
+    with pytest.raises(RuntimeError):
+        async with db_pool.write() as db:
+            await db.execute(INSERT_REPO, ("main", "repo-main"))
+            raise RuntimeError("failed before commit")
+
+    # The next writer must not commit the abandoned insert
+    async with db_pool.write() as db:
+        await db.execute(INSERT_REPO, ("dev", "repo-dev"))
+        await db.commit()
+
+    async with db_pool.reader() as db:
+        async with db.execute("SELECT pvc_path FROM repositories") as cursor:
+            assert [row['pvc_path'] for row in await cursor.fetchall()] == ["repo-dev"]
@@ -0,0 +1,67 @@
+import pytest
+import urllib3
+from kubernetes.client.rest import ApiException
+
+from app import k8s
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(k8s.time, "sleep", lambda seconds: None)
+
+def failing_then_ok(*errors):
+    remaining = list(errors)
+    def call():
+        if remaining:
+            raise remaining.pop(0)
+        return "ok"
+    return call
+
+def test_call_with_backoff_retries_connection_errors(no_sleep):
+    call = failing_then_ok(
+        urllib3.exceptions.MaxRetryError(None, "/api", "connection refused"),
+        urllib3.exceptions.ProtocolError("connection reset"),
+        urllib3.exceptions.ReadTimeoutError(None, "/api", "read timed out"),
+        ApiException(status=503),
+    )
+    assert k8s._call_with_backoff(call) == "ok"
+
+def test_call_with_backoff_raises_permanent_errors(no_sleep):
+    with pytest.raises(ApiException):
+        k8s._call_with_backoff(failing_then_ok(ApiException(status=404)))
+    with pytest.raises(urllib3.exceptions.LocationParseError):
+        k8s._call_with_backoff(failing_then_ok(urllib3.exceptions.LocationParseError("bad host")))
+
+class FakeShell:
+    """Answers each command written to stdin with its output split into small chunks."""
+    def __init__(self, output, chunk_size=3):
+        self.output = output
+        self.chunk_size = chunk_size
+        self.pending = []
+
+    def is_open(self):
+        return True
+
+    def write_stdin(self, data):
+        marker = data.split("'")[-2]
+        reply = f"{self.output}\n{marker} 0\n"
+        self.pending = [reply[i:i + self.chunk_size] for i in range(0, len(reply), self.chunk_size)]
+
+    def update(self, timeout):
+        pass
+
+    def peek_stdout(self):
+        return bool(self.pending)
+
+    def read_stdout(self):
+        return self.pending.pop(0)
+
+    def peek_stderr(self):
+        return False
+
+def test_exec_session_run_reassembles_chunked_output():
+    session = object.__new__(k8s.K8sExecSession)
+    session.pod_name = "opengrok-0"
+    session._lock = k8s.threading.Lock()
+    session._ws = FakeShell("line 1\nline 2")
+
+    assert session.run("cat log") == (0, "line 1\nline 2")
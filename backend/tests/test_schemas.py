@@ -0,0 +1,24 @@
+import pytest
+
+from app.schemas import validate_commit_id
+
+@pytest.mark.parametrize("commit_id", [
+    "main", "v1.2.3", "feature/login", "0123456789abcdef", ".hidden", "a.b/c.d",
+])
+def test_valid_commit_ids(commit_id):
+    assert validate_commit_id(commit_id) == commit_id
+
+@pytest.mark.parametrize("commit_id, message", [
+    ("", "cannot be empty"),
+    ("has space", "special characters"),
+    ("a~1", "special characters"),
+    ("a:b", "special characters"),
+    ("a[b]", "special characters"),
+    ("a\\b", "special characters"),
+    ("a..b", '".."'),
+    ("/main", '"/"'),
+    ("main/", '"/"'),
+])
+def test_invalid_commit_ids(commit_id, message):
+    with pytest.raises(ValueError, match=message):
+        validate_commit_id(commit_id)
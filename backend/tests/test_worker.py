@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from app import k8s, worker
+
+@pytest.mark.asyncio
+async def test_bulk_cleanup_deletes_only_removed_repositories(db_pool, monkeypatch):
+    monkeypatch.setattr(k8s, "exec_cleanup_repository", lambda pvc_path: pvc_path != "repo-b")
+    async with db_pool.write() as db:
+        await db.executemany(
+            "INSERT INTO repositories (id, repo_url, commit_id, status, job_name, pvc_path) "
+            "VALUES (?, 'https://example.com/org/repo.git', ?, 'DELETING', 'EXEC', ?)",
+            [(1, "a", "repo-a"), (2, "b", "repo-b")]
+        )
+        await db.commit()
+
+    await worker.perform_bulk_cleanup_task([(1, "repo-a"), (2, "repo-b")])
+
+    async with db_pool.reader() as db:
+        async with db.execute("SELECT id, status FROM repositories") as cursor:
+            rows = [tuple(row) for row in await cursor.fetchall()]
+    assert rows == [(2, "DELETION_FAILED")]
+
+@pytest.mark.asyncio
+async def test_bulk_cleanup_releases_exec_lock_between_paths(db_pool, monkeypatch):
+    monkeypatch.setattr(worker, "K8S_EXEC_LOCK", asyncio.Lock())
+    order = []
+    def exec_cleanup_repository(pvc_path):
+        time.sleep(0.05)
+        order.append(pvc_path)
+        return True
+    monkeypatch.setattr(k8s, "exec_cleanup_repository", exec_cleanup_repository)
+
+    async def other_exec():
+        await asyncio.sleep(0.01)  # Wait until the first removal holds the lock
+        async with worker.K8S_EXEC_LOCK:
+            order.append("other")
+
+    await asyncio.gather(
+        worker.perform_bulk_cleanup_task([(1, "repo-a"), (2, "repo-b")]),
+        other_exec(),
+    )
+    assert order == ["repo-a", "other", "repo-b"]